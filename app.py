@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.responses import JSONResponse
 from config import settings
+from utils.orjson_response import ORJSONResponse
 import uvicorn
 import logging
 import traceback
@@ -49,7 +50,8 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Pasugo - Bill Payment and Delivery Service API",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -205,6 +207,9 @@ def startup_event():
         if cache.enabled:
             if cache.ping():
                 logger.info("✅ Redis cache is connected and ready!")
+                if settings.REDIS_PURGE_LEGACY_KEYS:
+                    purged = cache.purge_legacy_keys()
+                    logger.info(f"🧹 Purged {purged} legacy (pre-msgpack) cache keys")
             else:
                 logger.warning("⚠️ Redis is configured but not reachable - caching disabled")
         else:
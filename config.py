@@ -19,10 +19,21 @@ class Settings(BaseSettings):
     
     # JWT Settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "pasugo-secret-key-2026-aiven-migration-production")
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")  # "HS256" or "EdDSA"
+    # Ed25519 PEM keys, only used when ALGORITHM is "EdDSA"
+    JWT_PRIVATE_KEY: str = os.getenv("JWT_PRIVATE_KEY", "")
+    JWT_PUBLIC_KEY: str = os.getenv("JWT_PUBLIC_KEY", "")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 525600  # 365 days – mobile app persistent login
     REFRESH_TOKEN_EXPIRE_DAYS: int = 365
     
+    # Password hashing: new hashes use PASSWORD_HASH_SCHEME ("argon2" or "bcrypt");
+    # hashes in the other scheme still verify and are upgraded on next login
+    PASSWORD_HASH_SCHEME: str = os.getenv("PASSWORD_HASH_SCHEME", "argon2")
+    # bcrypt work factor: 2^rounds iterations
+    # 0 = auto-tune at startup to ~BCRYPT_TARGET_MS per hash on this hardware
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "0"))
+    BCRYPT_TARGET_MS: int = int(os.getenv("BCRYPT_TARGET_MS", "250"))
+    
     # CORS Settings
     CORS_ORIGINS: List[str] = ["*"]
     
@@ -43,6 +54,11 @@ class Settings(BaseSettings):
     # Redis Settings
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     REDIS_ENABLED: bool = os.getenv("REDIS_ENABLED", "true").lower() == "true"
+    REDIS_POOL_SIZE: int = int(os.getenv("REDIS_POOL_SIZE", "32"))  # max connections per worker
+    # One-time cleanup of pre-msgpack cache keys on startup
+    REDIS_PURGE_LEGACY_KEYS: bool = os.getenv("REDIS_PURGE_LEGACY_KEYS", "false").lower() == "true"
+    # Per-worker in-process cache (≤5s) in front of Redis for hot keys
+    L1_CACHE_ENABLED: bool = os.getenv("L1_CACHE_ENABLED", "false").lower() == "true"
     
     # OpenRouteService (distance calculation)
     ORS_API_KEY: str = os.getenv("ORS_API_KEY", "eyJvcmciOiI1YjNjZTM1OTc4NTExMTAwMDFjZjYyNDgiLCJpZCI6IjcyZTc2YWMyODUwYzQ3NDNiYmJlNzU3YzNlYTYyZWQ0IiwiaCI6Im11cm11cjY0In0=")
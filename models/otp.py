@@ -3,6 +3,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
 import enum
+from datetime import timezone
 
 
 class OTPType(str, enum.Enum):
@@ -27,4 +28,9 @@ class OTP(Base):
     verified_at = Column(DateTime, nullable=True)
 
     # Relationships
-    user = relationship("User", back_populates="otps")
\ No newline at end of file
+    user = relationship("User", back_populates="otps")
+
+    @property
+    def expires_at_epoch(self) -> float:
+        """expires_at (stored as naive UTC) as a Unix timestamp"""
+        return self.expires_at.replace(tzinfo=timezone.utc).timestamp()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr, field_validator
 from database import get_db
@@ -8,6 +8,7 @@ from models.otp import OTP, OTPType
 from utils.security import (
     hash_password, 
     verify_password, 
+    password_needs_rehash,
     create_access_token, 
     create_refresh_token,
     verify_token,
@@ -256,7 +257,11 @@ async def get_current_user(
 # REGISTRATION OTP ROUTES
 # ============================================================================
 @router.post("/register/request-otp", status_code=status.HTTP_200_OK)
-def register_request_otp(request: RegisterOTPRequest, db: Session = Depends(get_db)):
+def register_request_otp(
+    request: RegisterOTPRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """
     Step 1: User requests OTP for registration
     
@@ -321,12 +326,9 @@ def register_request_otp(request: RegisterOTPRequest, db: Session = Depends(get_
         db.add(new_otp)
         db.commit()
         
-        # Send OTP via Brevo (only if configured)
+        # Send OTP via Brevo after the response is returned (only if configured)
         if brevo_sender:
-            result = brevo_sender.send_registration_otp(email, otp_code)
-            
-            if not result['success']:
-                logger.warning(f"Failed to send registration OTP to: {email}")
+            brevo_sender.enqueue_registration_otp(email, otp_code, background_tasks)
         else:
             logger.info(f"Email service not configured. Registration OTP for {email}: {otp_code}")
         
@@ -392,9 +394,9 @@ def register_verify_otp(request: VerifyRegistrationOTPRequest, db: Session = Dep
             )
         
         # Check if OTP is expired
-        now = datetime.utcnow()
-        logger.info(f"OTP check: now={now}, expires_at={otp.expires_at}, expired={now > otp.expires_at}")
-        if now > otp.expires_at:
+        expired = otp_manager.is_otp_expired_epoch(otp.expires_at_epoch)
+        logger.info(f"OTP check: expires_at={otp.expires_at}, expired={expired}")
+        if expired:
             db.delete(otp)
             db.commit()
             raise HTTPException(
@@ -518,7 +520,11 @@ def register_verify_otp(request: VerifyRegistrationOTPRequest, db: Session = Dep
 # ============================================================================
 
 @router.post("/forgot-password/request-otp", status_code=status.HTTP_200_OK)
-def forgot_password_request_otp(request: ForgotPasswordOTPRequest, db: Session = Depends(get_db)):
+def forgot_password_request_otp(
+    request: ForgotPasswordOTPRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """
     Step 1: User requests OTP for password reset
     
@@ -568,11 +574,9 @@ def forgot_password_request_otp(request: ForgotPasswordOTPRequest, db: Session =
                 db.add(new_otp)
                 db.commit()
                 
-                # Send OTP via Brevo (only if configured)
+                # Send OTP via Brevo after the response is returned (only if configured)
                 if brevo_sender:
-                    result = brevo_sender.send_password_reset_otp(email, otp_code)
-                    if not result['success']:
-                        logger.warning(f"Failed to send password reset OTP to: {email}")
+                    brevo_sender.enqueue_password_reset_otp(email, otp_code, background_tasks)
                 else:
                     logger.info(f"Email service not configured. Password reset OTP for {email}: {otp_code}")
             else:
@@ -632,7 +636,7 @@ def reset_password_with_otp(request: ResetPasswordOTPRequest, db: Session = Depe
             )
         
         # Check if OTP is expired
-        if otp_manager.is_otp_expired(otp.expires_at):
+        if otp_manager.is_otp_expired_epoch(otp.expires_at_epoch):
             db.delete(otp)
             db.commit()
             raise HTTPException(
@@ -697,7 +701,11 @@ def reset_password_with_otp(request: ResetPasswordOTPRequest, db: Session = Depe
 # ============================================================================
 
 @router.post("/otp/resend", status_code=status.HTTP_200_OK)
-def resend_otp(request: ResendOTPRequest, db: Session = Depends(get_db)):
+def resend_otp(
+    request: ResendOTPRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """
     Resend OTP to user
     
@@ -746,11 +754,9 @@ def resend_otp(request: ResendOTPRequest, db: Session = Depends(get_db)):
                 attempts=0
             )
             
-            # Send OTP via Brevo (only if configured)
+            # Send OTP via Brevo after the response is returned (only if configured)
             if brevo_sender:
-                result = brevo_sender.send_registration_otp(email, new_otp_code)
-                if not result['success']:
-                    logger.warning(f"Failed to resend registration OTP to: {email}")
+                brevo_sender.enqueue_registration_otp(email, new_otp_code, background_tasks)
             else:
                 logger.info(f"Email service not configured. Registration OTP for {email}: {new_otp_code}")
         
@@ -783,11 +789,9 @@ def resend_otp(request: ResendOTPRequest, db: Session = Depends(get_db)):
                 attempts=0
             )
             
-            # Send OTP via Brevo (only if configured)
+            # Send OTP via Brevo after the response is returned (only if configured)
             if brevo_sender:
-                result = brevo_sender.send_password_reset_otp(email, new_otp_code)
-                if not result['success']:
-                    logger.warning(f"Failed to resend password reset OTP to: {email}")
+                brevo_sender.enqueue_password_reset_otp(email, new_otp_code, background_tasks)
             else:
                 logger.info(f"Email service not configured. Password reset OTP for {email}: {new_otp_code}")
         
@@ -852,6 +856,12 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
                 detail="User account is inactive. Please contact support."
             )
         
+        # Upgrade legacy (bcrypt) or outdated hashes now that we have the plaintext
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = hash_password(request.password)
+            db.commit()
+            logger.info(f"Password hash upgraded for: {user.email}")
+        
         # Create access token (short-lived: 15 minutes)
         access_token = create_access_token(
             data={
@@ -7,15 +7,17 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
-import math
 from decimal import Decimal
 
+import numpy as np
+
 from database import get_db
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from routes.auth import get_current_user
 from models.user import User
-from utils.cache import cache
+from utils.cache import async_cache
+from utils.distance import haversine_distance_bulk
 
 # Create router
 router = APIRouter(prefix="/locations", tags=["locations"])
@@ -37,24 +39,22 @@ class LocationUpdate(BaseModel):
 # HELPER FUNCTIONS
 # ============================================
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two coordinates using Haversine formula"""
-    R = 6371  # Earth's radius in kilometers
-
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
+def riders_with_distance(lat: float, lng: float, rows) -> list:
+    """Pair each rider row that has a GPS fix with its distance (km) from (lat, lng).
 
-    a = (
-        math.sin(delta_lat / 2) ** 2
-        + math.cos(lat1_rad)
-        * math.cos(lat2_rad)
-        * math.sin(delta_lon / 2) ** 2
+    Columns 8/9 of each row are the rider's latitude/longitude. All distances are
+    computed in one vectorized haversine call.
+    """
+    located = [row for row in rows if row[8] and row[9]]
+    if not located:
+        return []
+    distances = haversine_distance_bulk(
+        lat,
+        lng,
+        np.array([float(row[8]) for row in located], dtype=np.float64),
+        np.array([float(row[9]) for row in located], dtype=np.float64),
     )
-    c = 2 * math.asin(math.sqrt(a))
-
-    return R * c
+    return list(zip(located, distances.tolist()))
 
 
 # ============================================
@@ -159,7 +159,7 @@ async def get_available_riders(
         grid_lat = round(lat, 2)
         grid_lng = round(lng, 2)
         cache_key = f"riders:available:{grid_lat}:{grid_lng}:{int(radius)}:{limit}"
-        cached = cache.get(cache_key)
+        cached = await async_cache.get(cache_key)
         if cached is not None:
             return cached
 
@@ -192,31 +192,25 @@ async def get_available_riders(
         ).fetchall()
 
         riders_list = []
-        for row in rows:
-            rider_lat = row[8]
-            rider_lng = row[9]
-            
-            if rider_lat and rider_lng:
-                distance = calculate_distance(lat, lng, float(rider_lat), float(rider_lng))
-                
-                # Filter by radius
-                if distance <= radius:
-                    riders_list.append({
-                        "rider_id": row[0],
-                        "user_id": row[1],
-                        "full_name": row[2],
-                        "phone_number": row[3],
-                        "vehicle_type": row[4],
-                        "availability_status": row[5],
-                        "rating": float(row[6]) if row[6] else 0.0,
-                        "total_tasks_completed": row[7],
-                        "latitude": float(rider_lat),
-                        "longitude": float(rider_lng),
-                        "accuracy": row[10],
-                        "address": row[11],
-                        "distance_km": round(distance, 2),
-                        "last_location_update": row[12].isoformat() if row[12] else None
-                    })
+        for row, distance in riders_with_distance(lat, lng, rows):
+            # Filter by radius
+            if distance <= radius:
+                riders_list.append({
+                    "rider_id": row[0],
+                    "user_id": row[1],
+                    "full_name": row[2],
+                    "phone_number": row[3],
+                    "vehicle_type": row[4],
+                    "availability_status": row[5],
+                    "rating": float(row[6]) if row[6] else 0.0,
+                    "total_tasks_completed": row[7],
+                    "latitude": float(row[8]),
+                    "longitude": float(row[9]),
+                    "accuracy": row[10],
+                    "address": row[11],
+                    "distance_km": round(distance, 2),
+                    "last_location_update": row[12].isoformat() if row[12] else None
+                })
 
         # Sort by distance
         riders_list.sort(key=lambda r: r["distance_km"])
@@ -231,7 +225,7 @@ async def get_available_riders(
                 "radius_km": radius
             }
         }
-        cache.set(cache_key, result, ttl=5)
+        await async_cache.set(cache_key, result, ttl=5)
         return result
 
     except Exception as e:
@@ -290,30 +284,24 @@ async def get_nearby_riders(
         rows = db.execute(text(query), params).fetchall()
 
         riders_list = []
-        for row in rows:
-            rider_lat = row[8]
-            rider_lng = row[9]
-            
-            if rider_lat and rider_lng:
-                distance = calculate_distance(lat, lng, float(rider_lat), float(rider_lng))
-                
-                if distance <= radius:
-                    riders_list.append({
-                        "rider_id": row[0],
-                        "user_id": row[1],
-                        "full_name": row[2],
-                        "phone_number": row[3],
-                        "vehicle_type": row[4],
-                        "availability_status": row[5],
-                        "rating": float(row[6]) if row[6] else 0.0,
-                        "total_tasks_completed": row[7],
-                        "latitude": float(rider_lat),
-                        "longitude": float(rider_lng),
-                        "accuracy": row[10],
-                        "address": row[11],
-                        "distance_km": round(distance, 2),
-                        "last_location_update": row[12].isoformat() if row[12] else None
-                    })
+        for row, distance in riders_with_distance(lat, lng, rows):
+            if distance <= radius:
+                riders_list.append({
+                    "rider_id": row[0],
+                    "user_id": row[1],
+                    "full_name": row[2],
+                    "phone_number": row[3],
+                    "vehicle_type": row[4],
+                    "availability_status": row[5],
+                    "rating": float(row[6]) if row[6] else 0.0,
+                    "total_tasks_completed": row[7],
+                    "latitude": float(row[8]),
+                    "longitude": float(row[9]),
+                    "accuracy": row[10],
+                    "address": row[11],
+                    "distance_km": round(distance, 2),
+                    "last_location_update": row[12].isoformat() if row[12] else None
+                })
 
         riders_list.sort(key=lambda r: r["distance_km"])
 
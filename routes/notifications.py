@@ -4,7 +4,9 @@ from database import get_db
 from models.user import User
 from models.notification import Notification
 from utils.dependencies import get_current_active_user
-from utils.cache import cache
+from utils.cache import cache, CachedNotification
+from utils.responses import success_dict
+import msgspec
 from datetime import datetime
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
@@ -18,33 +20,32 @@ def get_notifications(
     """Get user's notifications"""
     
     cache_key = f"notifications:list:{current_user.user_id}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
-    
-    notifications = db.query(Notification) \
-        .filter(Notification.user_id == current_user.user_id) \
-        .order_by(Notification.created_at.desc()) \
-        .limit(50) \
-        .all()
-    
-    result = {
-        "success": True,
-        "message": "Notifications retrieved successfully",
-        "data": [
-            {
-                "notification_id": n.notification_id,
-                "notification_type": n.notification_type,
-                "title": n.title,
-                "message": n.message,
-                "is_read": n.is_read,
-                "created_at": n.created_at.isoformat()
-            }
+    items = cache.get_as(cache_key, list[CachedNotification])
+    
+    if items is None:
+        notifications = db.query(Notification) \
+            .filter(Notification.user_id == current_user.user_id) \
+            .order_by(Notification.created_at.desc()) \
+            .limit(50) \
+            .all()
+        
+        items = [
+            CachedNotification(
+                notification_id=n.notification_id,
+                notification_type=n.notification_type.value,
+                title=n.title,
+                message=n.message,
+                is_read=bool(n.is_read),
+                created_at=n.created_at.isoformat()
+            )
             for n in notifications
         ]
-    }
-    cache.set(cache_key, result, ttl=10)
-    return result
+        cache.set(cache_key, items, ttl=10)
+    
+    return success_dict(
+        [msgspec.structs.asdict(n) for n in items],
+        "Notifications retrieved successfully"
+    )
 
 
 @router.get("/unread-count")
@@ -66,13 +67,7 @@ def get_unread_count(
         ) \
         .count()
     
-    result = {
-        "success": True,
-        "message": "Unread count retrieved successfully",
-        "data": {
-            "unread_count": count
-        }
-    }
+    result = success_dict({"unread_count": count}, "Unread count retrieved successfully")
     cache.set(cache_key, result, ttl=10)
     return result
 
@@ -102,8 +97,10 @@ def mark_as_read(
     db.commit()
     
     # Invalidate notification caches for this user
-    cache.delete(f"notifications:unread:{current_user.user_id}")
-    cache.delete(f"notifications:list:{current_user.user_id}")
+    cache.delete(
+        f"notifications:unread:{current_user.user_id}",
+        f"notifications:list:{current_user.user_id}",
+    )
     
     return {
         "success": True,
@@ -131,8 +128,10 @@ def mark_all_as_read(
     db.commit()
     
     # Invalidate notification caches for this user
-    cache.delete(f"notifications:unread:{current_user.user_id}")
-    cache.delete(f"notifications:list:{current_user.user_id}")
+    cache.delete(
+        f"notifications:unread:{current_user.user_id}",
+        f"notifications:list:{current_user.user_id}",
+    )
     
     return {
         "success": True,
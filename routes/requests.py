@@ -11,11 +11,13 @@ from utils.dependencies import get_current_active_user
 from utils.notification_helper import (
     notify_rider_selected, notify_rider_accepted, notify_delivery_started,
     notify_delivery_completed, notify_bill_submitted, notify_payment_received,
-    notify_payment_confirmed, notify_request_cancelled
+    notify_payment_confirmed, notify_request_cancelled,
+    invalidate_notification_caches
 )
 from decimal import Decimal
 from sqlalchemy import and_, text, func
 from utils.cache import cache
+from utils.responses import success_dict
 from utils.distance import compute_fee_between, calculate_service_fee
 import logging
 
@@ -341,11 +343,7 @@ def get_pending_requests_for_rider(
             "time_remaining_seconds": time_remaining
         })
 
-    return {
-        "success": True,
-        "message": f"Found {len(result)} pending requests",
-        "data": result
-    }
+    return success_dict(result, f"Found {len(result)} pending requests")
 
 
 # ===== PARAMETERIZED ROUTES BELOW =====
@@ -404,60 +402,56 @@ def get_request_details(
             "address": loc_row[2]
         }
 
-    return {
-        "success": True,
-        "message": "Request retrieved successfully",
-        "data": {
-            "request_id": request.request_id,
-            "customer_id": request.customer_id,
-            "customer_name": customer.full_name if customer else None,
-            "customer_phone": customer.phone_number if customer else None,
-            "customer_location": customer_location,
-            "rider_id": request.rider_id,
-            "rider_name": rider_name,
-            "rider_phone": rider_phone,
-            "service_type": enum_val(request.service_type),
-            "items_description": request.items_description,
-            "budget_limit": float(request.budget_limit) if request.budget_limit else None,
-            "special_instructions": request.special_instructions,
-            "status": enum_val(request.status),
-            "pickup_location": request.pickup_location,
-            "delivery_address": request.delivery_address,
-            "delivery_option": request.delivery_option,
-            "payment_method": enum_val(request.payment_method),
-            "item_cost": float(request.item_cost) if request.item_cost else None,
-            "service_fee": float(request.service_fee) if request.service_fee else None,
-            "total_amount": float(request.total_amount) if request.total_amount else None,
-            "gcash_reference": request.gcash_reference,
-            "gcash_screenshot_url": request.gcash_screenshot_url,
-            "payment_status": enum_val(request.payment_status),
-            "payment_proof_url": request.payment_proof_url,
-            "created_at": request.created_at.isoformat(),
-            "updated_at": request.updated_at.isoformat(),
-            "completed_at": request.completed_at.isoformat() if request.completed_at else None,
-            "bill_photos": [
-                {
-                    "photo_id": photo.photo_id,
-                    "photo_url": photo.photo_url,
-                    "file_name": photo.file_name,
-                    "file_size": photo.file_size,
-                    "created_at": photo.created_at.isoformat()
-                }
-                for photo in request.bill_photos
-            ],
-            "attachments": [
-                {
-                    "attachment_id": att.attachment_id,
-                    "file_name": att.file_name,
-                    "file_url": att.file_url,
-                    "file_type": att.file_type,
-                    "file_size": att.file_size,
-                    "created_at": att.created_at.isoformat()
-                }
-                for att in request.attachments
-            ]
-        }
-    }
+    return success_dict({
+        "request_id": request.request_id,
+        "customer_id": request.customer_id,
+        "customer_name": customer.full_name if customer else None,
+        "customer_phone": customer.phone_number if customer else None,
+        "customer_location": customer_location,
+        "rider_id": request.rider_id,
+        "rider_name": rider_name,
+        "rider_phone": rider_phone,
+        "service_type": enum_val(request.service_type),
+        "items_description": request.items_description,
+        "budget_limit": float(request.budget_limit) if request.budget_limit else None,
+        "special_instructions": request.special_instructions,
+        "status": enum_val(request.status),
+        "pickup_location": request.pickup_location,
+        "delivery_address": request.delivery_address,
+        "delivery_option": request.delivery_option,
+        "payment_method": enum_val(request.payment_method),
+        "item_cost": float(request.item_cost) if request.item_cost else None,
+        "service_fee": float(request.service_fee) if request.service_fee else None,
+        "total_amount": float(request.total_amount) if request.total_amount else None,
+        "gcash_reference": request.gcash_reference,
+        "gcash_screenshot_url": request.gcash_screenshot_url,
+        "payment_status": enum_val(request.payment_status),
+        "payment_proof_url": request.payment_proof_url,
+        "created_at": request.created_at.isoformat(),
+        "updated_at": request.updated_at.isoformat(),
+        "completed_at": request.completed_at.isoformat() if request.completed_at else None,
+        "bill_photos": [
+            {
+                "photo_id": photo.photo_id,
+                "photo_url": photo.photo_url,
+                "file_name": photo.file_name,
+                "file_size": photo.file_size,
+                "created_at": photo.created_at.isoformat()
+            }
+            for photo in request.bill_photos
+        ],
+        "attachments": [
+            {
+                "attachment_id": att.attachment_id,
+                "file_name": att.file_name,
+                "file_url": att.file_url,
+                "file_type": att.file_type,
+                "file_size": att.file_size,
+                "created_at": att.created_at.isoformat()
+            }
+            for att in request.attachments
+        ]
+    }, "Request retrieved successfully")
 
 
 @router.post("/{request_id}/add-bill-photo")
@@ -1285,7 +1279,7 @@ def confirm_payment(
 
     # Notify customer about payment confirmation
     try:
-        notify_payment_confirmed(db, request.customer_id, request.request_id)
+        notify_payment_confirmed(db, request.customer_id, request.request_id, commit=False)
     except Exception as e:
         notif_logger.warning(f"Failed to create payment confirmation notification: {e}")
 
@@ -1306,6 +1300,8 @@ def confirm_payment(
     db.commit()
     db.refresh(request)
     cache.delete(f"request:poll:{request_id}")
+    # The payment-confirmed notification was created with commit=False
+    invalidate_notification_caches(request.customer_id)
 
     msg = "Payment confirmed!"
     if delivery_auto_completed:
@@ -404,7 +404,7 @@ async def delete_file(
             )
         
         # Delete from Cloudinary
-        success = CloudinaryManager.delete_file(public_id, resource_type)
+        success = await CloudinaryManager.delete_file_async(public_id, resource_type)
         
         if success:
             logger.info(f"File deleted: {public_id}")
@@ -437,7 +437,7 @@ async def check_cloudinary_health():
     Useful for debugging upload issues.
     """
     try:
-        is_healthy = CloudinaryManager.health_check()
+        is_healthy = await CloudinaryManager.health_check_async()
         
         if is_healthy:
             return {
@@ -1,6 +1,6 @@
 from .security import hash_password, verify_password, create_access_token, verify_token
 from .dependencies import get_current_user, get_current_active_user
-from .responses import success_response, error_response
+from .responses import success_response, success_dict, error_response
 
 __all__ = [
     "hash_password",
@@ -10,5 +10,6 @@ __all__ = [
     "get_current_user",
     "get_current_active_user",
     "success_response",
+    "success_dict",
     "error_response",
 ]
\ No newline at end of file
@@ -1,28 +1,243 @@
 import os
 import logging
-from typing import Dict, Any
+import random
+import re
+import threading
+import time
+from functools import partialmethod
+from typing import Dict, Any, List, Optional
+
+from fastapi import BackgroundTasks
 
 logger = logging.getLogger(__name__)
 
-# DIAGNOSTIC LOGGING
-logger.info("=" * 70)
-logger.info("BREVO EMAIL MODULE - INITIALIZATION CHECK")
-logger.info("=" * 70)
+# HTTP dependencies are resolved once here; a missing package disables the sender
+# (see the singleton below) instead of breaking the import of this module.
+try:
+    import httpx
+    import orjson
+    _IMPORT_ERROR = None
+except ImportError as e:
+    httpx = orjson = None
+    _IMPORT_ERROR = e
 
-brevo_api_key = os.getenv("BREVO_API_KEY")
-sender_email = os.getenv("SENDER_EMAIL")
-sender_name = os.getenv("SENDER_NAME")
+# Retry policy for transient Brevo failures (rate limiting / server errors)
+SEND_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5               # seconds; doubles on each attempt
+RETRY_JITTER = 0.25                  # seconds of random jitter added to each delay
+MAX_RETRY_AFTER = 5.0                # longest Retry-After we'll sleep on (the send holds a threadpool thread)
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
 
-logger.info(f"BREVO_API_KEY exists: {bool(brevo_api_key)}")
-if brevo_api_key:
-    logger.info(f"BREVO_API_KEY starts with: {brevo_api_key[:15]}...")
-    logger.info(f"BREVO_API_KEY length: {len(brevo_api_key)} characters")
-else:
+# OTP email kind -> subject line (the kind doubles as the template email_type)
+_OTP_KINDS = {
+    "registration": "Your OTP Code for Registration",
+    "login": "Your OTP Code for Login",
+    "password_reset": "Reset Your Password - OTP Code",
+    "phone_verification": "Verify Your Phone Number - OTP Code",
+}
+
+# Brevo transactional email endpoint
+BREVO_SEND_URL = "https://api.brevo.com/v3/smtp/email"
+BREVO_TIMEOUT = 10.0                 # seconds
+
+# Brevo accepts at most this many messageVersions in one transactional request
+MAX_MESSAGE_VERSIONS = 1000
+
+# Client-side throttling to stay under the account's Brevo send rate
+BREVO_RPS = int(os.getenv("BREVO_RPS", "10"))                   # requests per second
+BREVO_CONCURRENCY = int(os.getenv("BREVO_CONCURRENCY", "10"))   # in-flight requests
+
+_BANNER = "=" * 70
+
+# Step-by-step startup diagnostics; enable with BREVO_VERBOSE=1 when debugging delivery
+VERBOSE = os.getenv("BREVO_VERBOSE") == "1"
+
+# Environment is read once at import; every sender instance shares these values
+_API_KEY = os.getenv("BREVO_API_KEY")
+_SENDER_EMAIL = os.getenv("SENDER_EMAIL", "bayadpasugo@gmail.com")
+_SENDER_NAME = os.getenv("SENDER_NAME", "Pasugo App")
+_SENDER_OBJ = {"name": _SENDER_NAME, "email": _SENDER_EMAIL}      # Brevo "sender" field
+_REPLY_TO_OBJ = {"email": _SENDER_EMAIL}                          # Brevo "replyTo" field
+
+# DIAGNOSTIC LOGGING (only in verbose mode, and skipped entirely unless INFO is enabled)
+if VERBOSE and logger.isEnabledFor(logging.INFO):
+    logger.info(_BANNER)
+    logger.info("BREVO EMAIL MODULE - INITIALIZATION CHECK")
+    logger.info(_BANNER)
+    logger.info("BREVO_API_KEY exists: %s", bool(_API_KEY))
+    if _API_KEY:
+        logger.info("BREVO_API_KEY starts with: %s...", _API_KEY[:15])
+        logger.info("BREVO_API_KEY length: %d characters", len(_API_KEY))
+    logger.info("SENDER_EMAIL: %s", _SENDER_EMAIL)
+    logger.info("SENDER_NAME: %s", _SENDER_NAME)
+    logger.info(_BANNER)
+
+if not _API_KEY:
     logger.error("❌ BREVO_API_KEY is NOT SET!")
 
-logger.info(f"SENDER_EMAIL: {sender_email or 'NOT SET'}")
-logger.info(f"SENDER_NAME: {sender_name or 'NOT SET'}")
-logger.info("=" * 70)
+
+# ---------------------------------------------------------------------------
+# HTML templates (minified once at import; filled in with str.format per send)
+# ---------------------------------------------------------------------------
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_BETWEEN_TAGS_RE = re.compile(r">\s+<")
+
+
+def _minify_html(template: str) -> str:
+    """Collapse indentation/newlines in an HTML template"""
+    return _BETWEEN_TAGS_RE.sub("><", _WHITESPACE_RE.sub(" ", template)).strip()
+
+
+_REGISTRATION_HTML = _minify_html("""
+<html>
+    <body style="font-family: Arial, sans-serif; background-color: #f5f5f5; padding: 20px;">
+        <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+            <h2 style="color: #333; text-align: center;">Welcome to Pasugo!</h2>
+            <p style="color: #666; font-size: 16px;">Your One-Time Password (OTP) for registration is:</p>
+
+            <div style="background-color: #007bff; color: white; padding: 20px; border-radius: 8px; text-align: center; margin: 20px 0;">
+                <p style="font-size: 14px; margin: 0 0 10px 0; color: #e0e0e0;">OTP Code</p>
+                <h1 style="font-size: 48px; letter-spacing: 5px; margin: 0; font-weight: bold;">{otp_code}</h1>
+            </div>
+
+            <p style="color: #999; font-size: 14px; text-align: center;">This code is valid for 10 minutes</p>
+
+            <hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">
+
+            <p style="color: #666; font-size: 14px;">If you didn't request this registration, please ignore this email and do not share this code with anyone.</p>
+
+            <p style="color: #666; font-size: 14px; margin-top: 20px;">
+                Best regards,<br>
+                <strong>Pasugo Team</strong>
+            </p>
+        </div>
+    </body>
+</html>
+""")
+
+_LOGIN_HTML = _minify_html("""
+<html>
+    <body style="font-family: Arial, sans-serif; background-color: #f5f5f5; padding: 20px;">
+        <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+            <h2 style="color: #333; text-align: center;">Login Verification</h2>
+            <p style="color: #666; font-size: 16px;">Your One-Time Password (OTP) for login is:</p>
+
+            <div style="background-color: #28a745; color: white; padding: 20px; border-radius: 8px; text-align: center; margin: 20px 0;">
+                <p style="font-size: 14px; margin: 0 0 10px 0; color: #e0e0e0;">OTP Code</p>
+                <h1 style="font-size: 48px; letter-spacing: 5px; margin: 0; font-weight: bold;">{otp_code}</h1>
+            </div>
+
+            <p style="color: #999; font-size: 14px; text-align: center;">This code is valid for 10 minutes</p>
+
+            <hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">
+
+            <p style="color: #666; font-size: 14px;">If you didn't request this login, please ignore this email. Do not share this code with anyone.</p>
+
+            <p style="color: #666; font-size: 14px; margin-top: 20px;">
+                Best regards,<br>
+                <strong>Pasugo Team</strong>
+            </p>
+        </div>
+    </body>
+</html>
+""")
+
+_PASSWORD_RESET_HTML = _minify_html("""
+<html>
+    <body style="font-family: Arial, sans-serif; background-color: #f5f5f5; padding: 20px;">
+        <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+            <h2 style="color: #333; text-align: center;">Password Reset Request</h2>
+            <p style="color: #666; font-size: 16px;">Your One-Time Password (OTP) to reset your password is:</p>
+
+            <div style="background-color: #dc3545; color: white; padding: 20px; border-radius: 8px; text-align: center; margin: 20px 0;">
+                <p style="font-size: 14px; margin: 0 0 10px 0; color: #e0e0e0;">OTP Code</p>
+                <h1 style="font-size: 48px; letter-spacing: 5px; margin: 0; font-weight: bold;">{otp_code}</h1>
+            </div>
+
+            <p style="color: #999; font-size: 14px; text-align: center;">This code is valid for 10 minutes</p>
+
+            <hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">
+
+            <p style="color: #666; font-size: 14px;">If you didn't request a password reset, please ignore this email and your account remains secure.</p>
+
+            <p style="color: #999; font-size: 12px; margin-top: 20px;">
+                <strong>For security:</strong> Never share your OTP with anyone, including Pasugo support staff.
+            </p>
+
+            <p style="color: #666; font-size: 14px; margin-top: 20px;">
+                Best regards,<br>
+                <strong>Pasugo Team</strong>
+            </p>
+        </div>
+    </body>
+</html>
+""")
+
+_PHONE_VERIFICATION_HTML = _minify_html("""
+<html>
+    <body style="font-family: Arial, sans-serif; background-color: #f5f5f5; padding: 20px;">
+        <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+            <h2 style="color: #333; text-align: center;">Verify Your Phone Number</h2>
+            <p style="color: #666; font-size: 16px;">Your One-Time Password (OTP) to verify your phone number {phone_display} is:</p>
+
+            <div style="background-color: #ffc107; color: white; padding: 20px; border-radius: 8px; text-align: center; margin: 20px 0;">
+                <p style="font-size: 14px; margin: 0 0 10px 0; color: #333;">OTP Code</p>
+                <h1 style="font-size: 48px; letter-spacing: 5px; margin: 0; font-weight: bold;">{otp_code}</h1>
+            </div>
+
+            <p style="color: #999; font-size: 14px; text-align: center;">This code is valid for 10 minutes</p>
+
+            <hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">
+
+            <p style="color: #666; font-size: 14px;">If you didn't request this verification, please ignore this email.</p>
+
+            <p style="color: #666; font-size: 14px; margin-top: 20px;">
+                Best regards,<br>
+                <strong>Pasugo Team</strong>
+            </p>
+        </div>
+    </body>
+</html>
+""")
+
+if logger.isEnabledFor(logging.DEBUG):
+    for _name, _template in (
+        ("registration", _REGISTRATION_HTML),
+        ("login", _LOGIN_HTML),
+        ("password_reset", _PASSWORD_RESET_HTML),
+        ("phone_verification", _PHONE_VERIFICATION_HTML),
+    ):
+        logger.debug("Brevo %s template: %d bytes", _name, len(_template.encode()))
+
+
+def _phone_display(phone_number: Optional[str]) -> str:
+    """Phone number as shown in the verification email ("" when there is none)"""
+    return f"({phone_number})" if phone_number else ""
+
+
+class _RateLimiter:
+    """Thread-safe token bucket: at most *rate* acquisitions per *period* seconds"""
+    
+    def __init__(self, rate: int, period: float = 1.0):
+        self.capacity = max(1, rate)
+        self.refill_per_sec = self.capacity / period
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.refill_per_sec
+            time.sleep(wait)
 
 
 class BrevoEmailSender:
@@ -30,76 +245,107 @@ class BrevoEmailSender:
     
     def __init__(self):
         """Initialize Brevo API configuration"""
-        logger.info("Initializing BrevoEmailSender class...")
+        if VERBOSE:
+            logger.info("Initializing BrevoEmailSender class...")
         
-        try:
-            logger.info("Attempting to import sib_api_v3_sdk...")
-            from sib_api_v3_sdk import ApiClient, Configuration, TransactionalEmailsApi
-            from sib_api_v3_sdk import SendSmtpEmail
-            logger.info("✅ sib_api_v3_sdk imported successfully")
-        except ImportError as e:
-            logger.error(f"❌ Failed to import sib_api_v3_sdk: {e}")
-            raise
+        if _IMPORT_ERROR is not None:
+            logger.error("❌ Failed to import Brevo HTTP dependencies: %s", _IMPORT_ERROR)
+            raise _IMPORT_ERROR
         
-        api_key = os.getenv("BREVO_API_KEY")
+        api_key = _API_KEY
         
         if not api_key:
             logger.error("❌ BREVO_API_KEY not found in environment variables")
             raise ValueError("BREVO_API_KEY not found in environment variables")
         
-        logger.info(f"✅ BREVO_API_KEY found (length: {len(api_key)})")
+        if VERBOSE:
+            logger.info("✅ BREVO_API_KEY found (length: %d)", len(api_key))
+        
+        # Shared keep-alive client for the Brevo REST API (payloads are pre-encoded with orjson)
+        self._http = httpx.Client(
+            headers={
+                "api-key": api_key,
+                "accept": "application/json",
+                "content-type": "application/json"
+            },
+            timeout=BREVO_TIMEOUT
+        )
         
-        # Configure Brevo API client
-        logger.info("Configuring Brevo API client...")
-        configuration = Configuration()
-        configuration.api_key["api-key"] = api_key
+        self.sender_email = _SENDER_EMAIL
+        self.sender_name = _SENDER_NAME
+        # Sender / reply-to never change, so every payload shares the module-level dicts
+        self._sender = _SENDER_OBJ
+        self._reply_to = _REPLY_TO_OBJ
         
-        self.api_client = ApiClient(configuration)
-        self.api_instance = TransactionalEmailsApi(self.api_client)
-        self.SendSmtpEmail = SendSmtpEmail
+        # email_type -> template renderer (phone verification also takes the phone number)
+        self._simple_renderers = {
+            "registration": self._get_registration_html,
+            "login": self._get_login_html,
+            "password_reset": self._get_password_reset_html,
+        }
+        self._param_renderers = {
+            "phone_verification": self._get_phone_verification_html,
+        }
         
-        self.sender_email = os.getenv("SENDER_EMAIL", "bayadpasugo@gmail.com")
-        self.sender_name = os.getenv("SENDER_NAME", "Pasugo App")
+        # Caps in-flight requests and request rate against the Brevo API
+        self._send_slots = threading.BoundedSemaphore(BREVO_CONCURRENCY)
+        self._limiter = _RateLimiter(BREVO_RPS, 1.0)
         
-        logger.info(f"✅ Brevo API configured successfully")
-        logger.info(f"✅ Sender: {self.sender_name} <{self.sender_email}>")
+        logger.info("✅ Brevo API configured (sender: %s <%s>)", self.sender_name, self.sender_email)
     
-    def send_registration_otp(self, recipient_email: str, otp_code: str) -> Dict[str, Any]:
-        """Send OTP email for registration"""
-        return self._send_otp_email(
-            recipient_email=recipient_email,
-            otp_code=otp_code,
-            subject="Your OTP Code for Registration",
-            email_type="registration"
-        )
+    def send_otp(
+        self,
+        kind: str,
+        recipient_email: str,
+        otp_code: str,
+        phone_number: str = None
+    ) -> Dict[str, Any]:
+        """Send an OTP email of the given kind (see _OTP_KINDS)"""
+        try:
+            subject = _OTP_KINDS[kind]
+        except KeyError:
+            raise ValueError(f"Unknown OTP email kind: {kind}")
+        return self._send_otp_email(recipient_email, otp_code, subject, kind, phone_number)
     
-    def send_login_otp(self, recipient_email: str, otp_code: str) -> Dict[str, Any]:
-        """Send OTP email for login"""
-        return self._send_otp_email(
-            recipient_email=recipient_email,
-            otp_code=otp_code,
-            subject="Your OTP Code for Login",
-            email_type="login"
-        )
+    send_registration_otp = partialmethod(send_otp, "registration")
+    send_login_otp = partialmethod(send_otp, "login")
+    send_password_reset_otp = partialmethod(send_otp, "password_reset")
+    send_phone_verification_otp = partialmethod(send_otp, "phone_verification")
     
-    def send_password_reset_otp(self, recipient_email: str, otp_code: str) -> Dict[str, Any]:
-        """Send OTP email for password reset"""
-        return self._send_otp_email(
-            recipient_email=recipient_email,
-            otp_code=otp_code,
-            subject="Reset Your Password - OTP Code",
-            email_type="password_reset"
-        )
+    def enqueue_otp(
+        self,
+        kind: str,
+        recipient_email: str,
+        otp_code: str,
+        tasks: BackgroundTasks,
+        phone_number: str = None
+    ) -> None:
+        """Queue an OTP email of the given kind to be sent after the response is returned"""
+        tasks.add_task(self._send_in_background, kind, recipient_email, otp_code, phone_number)
     
-    def send_phone_verification_otp(self, recipient_email: str, otp_code: str, phone_number: str) -> Dict[str, Any]:
-        """Send OTP email for phone verification"""
-        return self._send_otp_email(
-            recipient_email=recipient_email,
-            otp_code=otp_code,
-            subject="Verify Your Phone Number - OTP Code",
-            email_type="phone_verification",
-            phone_number=phone_number
-        )
+    enqueue_registration_otp = partialmethod(enqueue_otp, "registration")
+    enqueue_login_otp = partialmethod(enqueue_otp, "login")
+    enqueue_password_reset_otp = partialmethod(enqueue_otp, "password_reset")
+    
+    def enqueue_phone_verification_otp(
+        self,
+        recipient_email: str,
+        otp_code: str,
+        phone_number: str,
+        tasks: BackgroundTasks
+    ) -> None:
+        """Queue a phone verification OTP email to be sent after the response is returned"""
+        self.enqueue_otp("phone_verification", recipient_email, otp_code, tasks, phone_number)
+    
+    def _send_in_background(self, kind: str, recipient_email: str, otp_code: str, phone_number: str = None) -> None:
+        """Background task body: send the OTP email and log undelivered emails"""
+        result = self.send_otp(kind, recipient_email, otp_code, phone_number)
+        if not result["success"]:
+            logger.warning(
+                "otp_not_delivered recipient=%s email_type=%s",
+                recipient_email, kind,
+                extra={"recipient": recipient_email, "email_type": kind}
+            )
     
     def _send_otp_email(
         self,
@@ -112,181 +358,242 @@ class BrevoEmailSender:
         """Internal method to send OTP yup"""
         
         try:
-            # Create HTML content based on email type
-            if email_type == "registration":
-                html_content = self._get_registration_html(otp_code)
-            elif email_type == "login":
-                html_content = self._get_login_html(otp_code)
-            elif email_type == "phone_verification":
-                html_content = self._get_phone_verification_html(otp_code, phone_number)
-            else:  # password_reset
-                html_content = self._get_password_reset_html(otp_code)
+            html_content = self._render_html(email_type, otp_code, phone_number)
             
-            # Create email object for Brevo SDK
-            send_smtp_email = self.SendSmtpEmail(
-                to=[{"email": recipient_email}],
-                sender={"name": self.sender_name, "email": self.sender_email},
-                subject=subject,
-                html_content=html_content,
-                reply_to={"email": self.sender_email}
-            )
+            # Brevo API payload
+            payload = {
+                "to": [{"email": recipient_email}],
+                "sender": self._sender,
+                "subject": subject,
+                "htmlContent": html_content,
+                "replyTo": self._reply_to
+            }
             
             # Send email via Brevo API
-            logger.info(f"Sending {email_type} OTP to {recipient_email}...")
-            response = self.api_instance.send_transac_email(send_smtp_email)
+            response = self._send_with_retry(payload)
             
-            logger.info(f"✅ OTP email sent successfully to {recipient_email} (Type: {email_type})")
+            logger.info(
+                "otp_sent recipient=%s email_type=%s",
+                recipient_email, email_type,
+                extra={
+                    "recipient": recipient_email,
+                    "email_type": email_type,
+                    "message_id": response.get("messageId")
+                }
+            )
             
             return {
                 "success": True,
                 "message": "OTP sent to your email",
-                "message_id": getattr(response, 'message_id', None)
+                "message_id": response.get("messageId")
+            }
+        
+        except httpx.HTTPStatusError as e:
+            logger.warning(
+                "otp_send_failed recipient=%s status=%s body=%s",
+                recipient_email, e.response.status_code, e.response.text,
+                extra={"recipient": recipient_email, "email_type": email_type, "status": e.response.status_code}
+            )
+            return {
+                "success": False,
+                "message": "Failed to send OTP",
+                "error": str(e)
+            }
+        
+        except httpx.TransportError as e:
+            logger.warning(
+                "otp_send_failed recipient=%s error=%s",
+                recipient_email, e,
+                extra={"recipient": recipient_email, "email_type": email_type}
+            )
+            return {
+                "success": False,
+                "message": "Failed to send OTP",
+                "error": str(e)
             }
         
         except Exception as e:
-            logger.error(f"❌ Error sending OTP email to {recipient_email}: {str(e)}", exc_info=True)
+            logger.error(
+                "otp_send_error recipient=%s error=%s",
+                recipient_email, e,
+                exc_info=True,
+                extra={"recipient": recipient_email, "email_type": email_type}
+            )
             return {
                 "success": False,
                 "message": "Failed to send OTP",
                 "error": str(e)
             }
     
+    def send_bulk_otp(self, recipients: List[Dict[str, str]], subject: str, email_type: str) -> Dict[str, Any]:
+        """
+        Send OTP emails to many recipients with one Brevo request per 1000 recipients
+        
+        The HTML is rendered once with Brevo template placeholders and each recipient
+        gets its own messageVersion carrying their OTP code (and phone number for
+        phone_verification emails).
+        
+        Args:
+            recipients: List of dicts with "email", "otp_code" and optionally "phone_number"
+            subject: Email subject shared by all recipients
+            email_type: registration, login, password_reset or phone_verification
+        
+        Returns:
+            Dict with success flag, number of emails sent and Brevo message IDs
+        """
+        # The parenthesised phone number is built per recipient, so an empty one
+        # renders as nothing rather than "()"
+        html_content = self._render_html(
+            email_type, "{{ params.otp_code }}", phone_display="{{ params.phone_display }}"
+        )
+        message_ids = []
+        sent = 0
+        
+        try:
+            for start in range(0, len(recipients), MAX_MESSAGE_VERSIONS):
+                batch = recipients[start:start + MAX_MESSAGE_VERSIONS]
+                payload = {
+                    "sender": self._sender,
+                    "subject": subject,
+                    "htmlContent": html_content,
+                    "replyTo": self._reply_to,
+                    "messageVersions": [
+                        {
+                            "to": [{"email": r["email"]}],
+                            "params": {
+                                "otp_code": r["otp_code"],
+                                "phone_display": _phone_display(r.get("phone_number"))
+                            }
+                        }
+                        for r in batch
+                    ]
+                }
+                response = self._send_with_retry(payload)
+                message_ids.extend(response.get("messageIds") or [])
+                sent += len(batch)
+            
+            logger.info(
+                "otp_bulk_sent email_type=%s recipients=%d",
+                email_type, sent,
+                extra={"email_type": email_type, "recipients": sent}
+            )
+            return {
+                "success": True,
+                "message": "OTP emails sent",
+                "sent": sent,
+                "message_ids": message_ids
+            }
+        
+        except Exception as e:
+            # API / network failures are expected here; only unexpected errors need a traceback
+            expected = isinstance(e, (httpx.HTTPStatusError, httpx.TransportError))
+            logger.log(
+                logging.WARNING if expected else logging.ERROR,
+                "otp_bulk_send_failed email_type=%s sent=%d total=%d error=%s",
+                email_type, sent, len(recipients), e,
+                exc_info=not expected,
+                extra={"email_type": email_type, "sent": sent, "total": len(recipients)}
+            )
+            return {
+                "success": False,
+                "message": "Failed to send OTP",
+                "sent": sent,
+                "message_ids": message_ids,
+                "error": str(e)
+            }
+    
+    def _render_html(
+        self, email_type: str, otp_code: str, phone_number: str = None, phone_display: str = None
+    ) -> str:
+        """Build the HTML body for an OTP email type (unknown types fall back to password reset)"""
+        renderer = self._param_renderers.get(email_type)
+        if renderer is not None:
+            return renderer(otp_code, phone_number, phone_display)
+        return self._simple_renderers.get(email_type, self._get_password_reset_html)(otp_code)
+    
+    def _post_email(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a transactional email payload to Brevo and return the decoded JSON response"""
+        body = orjson.dumps(payload)
+        with self._send_slots:
+            self._limiter.acquire()
+            response = self._http.post(BREVO_SEND_URL, content=body)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def _send_with_retry(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send via Brevo, retrying 429/5xx and connection errors with exponential backoff
+        
+        Client errors (400/401/403...) are configuration problems and are raised immediately.
+        """
+        for attempt in range(1, SEND_MAX_ATTEMPTS + 1):
+            try:
+                return self._post_email(payload)
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                if status_code not in RETRYABLE_STATUSES or attempt == SEND_MAX_ATTEMPTS:
+                    raise
+                delay = self._retry_delay(attempt, e.response)
+                if delay is None:
+                    # Brevo asked us to back off longer than we're willing to block for
+                    raise
+            except httpx.TransportError:
+                if attempt == SEND_MAX_ATTEMPTS:
+                    raise
+                status_code = None
+                delay = self._retry_delay(attempt)
+            
+            logger.warning(
+                "otp_send_retry attempt=%d/%d status=%s retry_in=%.2fs",
+                attempt, SEND_MAX_ATTEMPTS, status_code, delay,
+                extra={"attempt": attempt, "status": status_code, "retry_in": delay}
+            )
+            time.sleep(delay)
+    
+    @staticmethod
+    def _retry_delay(attempt: int, response=None) -> Optional[float]:
+        """Backoff delay before the next attempt, honoring Retry-After on 429
+        
+        Returns None when Retry-After exceeds MAX_RETRY_AFTER, meaning give up.
+        """
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = float(retry_after)
+                return delay if delay <= MAX_RETRY_AFTER else None
+        return RETRY_BASE_DELAY * (2 ** (attempt - 1)) + random.uniform(0, RETRY_JITTER)
+    
     def _get_registration_html(self, otp_code: str) -> str:
         """HTML template for registration OTP"""
-        return f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; background-color: #f5f5f5; padding: 20px;">
-                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                    <h2 style="color: #333; text-align: center;">Welcome to Pasugo!</h2>
-                    <p style="color: #666; font-size: 16px;">Your One-Time Password (OTP) for registration is:</p>
-                    
-                    <div style="background-color: #007bff; color: white; padding: 20px; border-radius: 8px; text-align: center; margin: 20px 0;">
-                        <p style="font-size: 14px; margin: 0 0 10px 0; color: #e0e0e0;">OTP Code</p>
-                        <h1 style="font-size: 48px; letter-spacing: 5px; margin: 0; font-weight: bold;">{otp_code}</h1>
-                    </div>
-                    
-                    <p style="color: #999; font-size: 14px; text-align: center;">This code is valid for 10 minutes</p>
-                    
-                    <hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">
-                    
-                    <p style="color: #666; font-size: 14px;">If you didn't request this registration, please ignore this email and do not share this code with anyone.</p>
-                    
-                    <p style="color: #666; font-size: 14px; margin-top: 20px;">
-                        Best regards,<br>
-                        <strong>Pasugo Team</strong>
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        return _REGISTRATION_HTML.format(otp_code=otp_code)
     
     def _get_login_html(self, otp_code: str) -> str:
         """HTML template for login OTP"""
-        return f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; background-color: #f5f5f5; padding: 20px;">
-                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                    <h2 style="color: #333; text-align: center;">Login Verification</h2>
-                    <p style="color: #666; font-size: 16px;">Your One-Time Password (OTP) for login is:</p>
-                    
-                    <div style="background-color: #28a745; color: white; padding: 20px; border-radius: 8px; text-align: center; margin: 20px 0;">
-                        <p style="font-size: 14px; margin: 0 0 10px 0; color: #e0e0e0;">OTP Code</p>
-                        <h1 style="font-size: 48px; letter-spacing: 5px; margin: 0; font-weight: bold;">{otp_code}</h1>
-                    </div>
-                    
-                    <p style="color: #999; font-size: 14px; text-align: center;">This code is valid for 10 minutes</p>
-                    
-                    <hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">
-                    
-                    <p style="color: #666; font-size: 14px;">If you didn't request this login, please ignore this email. Do not share this code with anyone.</p>
-                    
-                    <p style="color: #666; font-size: 14px; margin-top: 20px;">
-                        Best regards,<br>
-                        <strong>Pasugo Team</strong>
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        return _LOGIN_HTML.format(otp_code=otp_code)
     
     def _get_password_reset_html(self, otp_code: str) -> str:
         """HTML template for password reset OTP"""
-        return f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; background-color: #f5f5f5; padding: 20px;">
-                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                    <h2 style="color: #333; text-align: center;">Password Reset Request</h2>
-                    <p style="color: #666; font-size: 16px;">Your One-Time Password (OTP) to reset your password is:</p>
-                    
-                    <div style="background-color: #dc3545; color: white; padding: 20px; border-radius: 8px; text-align: center; margin: 20px 0;">
-                        <p style="font-size: 14px; margin: 0 0 10px 0; color: #e0e0e0;">OTP Code</p>
-                        <h1 style="font-size: 48px; letter-spacing: 5px; margin: 0; font-weight: bold;">{otp_code}</h1>
-                    </div>
-                    
-                    <p style="color: #999; font-size: 14px; text-align: center;">This code is valid for 10 minutes</p>
-                    
-                    <hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">
-                    
-                    <p style="color: #666; font-size: 14px;">If you didn't request a password reset, please ignore this email and your account remains secure.</p>
-                    
-                    <p style="color: #999; font-size: 12px; margin-top: 20px;">
-                        <strong>For security:</strong> Never share your OTP with anyone, including Pasugo support staff.
-                    </p>
-                    
-                    <p style="color: #666; font-size: 14px; margin-top: 20px;">
-                        Best regards,<br>
-                        <strong>Pasugo Team</strong>
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        return _PASSWORD_RESET_HTML.format(otp_code=otp_code)
     
-    def _get_phone_verification_html(self, otp_code: str, phone_number: str = None) -> str:
-        """HTML template for phone verification OTP"""
-        phone_display = f"({phone_number})" if phone_number else ""
-        
-        return f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; background-color: #f5f5f5; padding: 20px;">
-                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                    <h2 style="color: #333; text-align: center;">Verify Your Phone Number</h2>
-                    <p style="color: #666; font-size: 16px;">Your One-Time Password (OTP) to verify your phone number {phone_display} is:</p>
-                    
-                    <div style="background-color: #ffc107; color: white; padding: 20px; border-radius: 8px; text-align: center; margin: 20px 0;">
-                        <p style="font-size: 14px; margin: 0 0 10px 0; color: #333;">OTP Code</p>
-                        <h1 style="font-size: 48px; letter-spacing: 5px; margin: 0; font-weight: bold;">{otp_code}</h1>
-                    </div>
-                    
-                    <p style="color: #999; font-size: 14px; text-align: center;">This code is valid for 10 minutes</p>
-                    
-                    <hr style="border: none; border-top: 1px solid #e0e0e0; margin: 20px 0;">
-                    
-                    <p style="color: #666; font-size: 14px;">If you didn't request this verification, please ignore this email.</p>
-                    
-                    <p style="color: #666; font-size: 14px; margin-top: 20px;">
-                        Best regards,<br>
-                        <strong>Pasugo Team</strong>
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+    def _get_phone_verification_html(
+        self, otp_code: str, phone_number: str = None, phone_display: str = None
+    ) -> str:
+        """HTML template for phone verification OTP (phone_display, if given, is used verbatim)"""
+        if phone_display is None:
+            phone_display = _phone_display(phone_number)
+        return _PHONE_VERIFICATION_HTML.format(otp_code=otp_code, phone_display=phone_display)
 
 
 # Create singleton instance
-logger.info("Attempting to create BrevoEmailSender singleton instance...")
 try:
     brevo_sender = BrevoEmailSender()
-    logger.info("✅✅✅ SUCCESS: Brevo Email Service initialized and ready!")
 except ValueError as e:
-    logger.error(f"❌ Configuration Error: {e}")
+    logger.error("❌ Configuration Error: %s", e)
     brevo_sender = None
 except ImportError as e:
-    logger.error(f"❌ Import Error: {e}")
+    logger.error("❌ Import Error: %s", e)
     brevo_sender = None
 except Exception as e:
-    logger.error(f"❌ Unexpected Error: {type(e).__name__}: {str(e)}", exc_info=True)
+    logger.error("❌ Unexpected Error: %s: %s", type(e).__name__, e, exc_info=True)
     brevo_sender = None
 
 if brevo_sender is None:
@@ -294,4 +601,3 @@ if brevo_sender is None:
 else:
     logger.info("📧📧📧 Brevo Email Service is ACTIVE and ready to send emails")
 
-logger.info("=" * 70)
\ No newline at end of file
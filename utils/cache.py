@@ -13,19 +13,62 @@ Usage in routes:
 
     # Delete (invalidation)
     cache.delete("key")
+    cache.delete("key1", "key2")          # several keys, one round-trip
     cache.delete_pattern("notifications:user:42:*")
+
+Inside ``async def`` routes use the event-loop client instead, so Redis
+round-trips don't block the worker:
+    from utils.cache import async_cache
+
+    data = await async_cache.get("key")
+    await async_cache.set("key", data, ttl=30)
 """
 
-import json
+import asyncio
+import fnmatch
+import functools
+import inspect
 import logging
+import threading
 import time
-from typing import Optional, Any
+from typing import Optional, Any, Type, TypeVar
 
+import msgspec
+from cachetools import TTLCache
 import redis
+import redis.asyncio as aioredis
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Values are stored as msgpack bytes. msgspec handles datetime / Decimal / UUID
+# natively; anything else falls back to str() like the old json default=str.
+_encoder = msgspec.msgpack.Encoder(enc_hook=str)
+_decoder = msgspec.msgpack.Decoder()
+
+T = TypeVar("T")
+
+
+@functools.lru_cache(maxsize=None)
+def _typed_decoder(type_) -> msgspec.msgpack.Decoder:
+    """One Decoder per target type (e.g. list[CachedNotification])."""
+    return msgspec.msgpack.Decoder(type=type_)
+
+
+# All msgpack-encoded keys live under this prefix so they never collide with
+# JSON values written by older deployments.
+KEY_PREFIX = "mp:"
+
+
+def _key(key: str) -> str:
+    return KEY_PREFIX + key
+
+
+# Key namespaces the JSON-era deployments wrote (without KEY_PREFIX). Purging
+# is limited to these so a shared Redis database keeps other apps' keys.
+_LEGACY_KEY_PATTERNS = ("notifications:*", "request:*", "rider:*", "riders:*")
+
+
 # ---------------------------------------------------------------------------
 # Redis connection (singleton with retry cooldown)
 # ---------------------------------------------------------------------------
@@ -35,12 +78,36 @@ _redis_last_fail: float = 0.0       # epoch of last connection failure
 _REDIS_RETRY_INTERVAL = 60.0        # seconds before retrying after a failure
 _redis_warned: bool = False          # only warn once per cooldown period
 
+# The flag can't change at runtime; read it once instead of hitting settings per call
+_SETTINGS_ENABLED: bool = settings.REDIS_ENABLED
+
+# Bounded pool shared by every client: callers wait up to `timeout` seconds for a
+# free connection instead of opening unbounded sockets under bursty load.
+# Built on first connect (inside the try below) so a bad REDIS_URL degrades to
+# "no cache" instead of failing the import.
+_redis_pool: Optional[redis.BlockingConnectionPool] = None
+# Routes hit _get_redis from the threadpool; only one of them may build the pool
+_redis_pool_lock = threading.Lock()
+
+
+def _build_redis_pool() -> redis.BlockingConnectionPool:
+    return redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_POOL_SIZE,
+        timeout=2,
+        decode_responses=False,  # raw bytes go straight to msgpack
+        socket_connect_timeout=3,
+        socket_timeout=2,
+        retry_on_timeout=True,
+        health_check_interval=30,
+    )
+
 
 def _get_redis() -> Optional[redis.Redis]:
     """Return a Redis client, or None if Redis is disabled / unreachable."""
-    global _redis_client, _redis_last_fail, _redis_warned
+    global _redis_client, _redis_pool, _redis_last_fail, _redis_warned
 
-    if not settings.REDIS_ENABLED:
+    if not _SETTINGS_ENABLED:
         return None
 
     if _redis_client is not None:
@@ -52,13 +119,11 @@ def _get_redis() -> Optional[redis.Redis]:
         return None
 
     try:
-        _redis_client = redis.from_url(
-            settings.REDIS_URL,
-            decode_responses=True,   # always return str, not bytes
-            socket_connect_timeout=3,
-            socket_timeout=2,
-            retry_on_timeout=True,
-        )
+        if _redis_pool is None:
+            with _redis_pool_lock:
+                if _redis_pool is None:
+                    _redis_pool = _build_redis_pool()
+        _redis_client = redis.Redis(connection_pool=_redis_pool)
         # Quick ping to verify connectivity
         _redis_client.ping()
         logger.info("✅ Redis connected successfully")
@@ -73,6 +138,187 @@ def _get_redis() -> Optional[redis.Redis]:
         return None
 
 
+# BlockingConnectionPool raises ConnectionError with this message when every
+# connection stayed busy for its `timeout`. That is a traffic burst, not an
+# outage, so it only costs the caller a cache miss.
+_POOL_EXHAUSTED_MSG = "No connection available."
+
+
+def _is_pool_exhausted(exc: Exception) -> bool:
+    return isinstance(exc, redis.ConnectionError) and str(exc) == _POOL_EXHAUSTED_MSG
+
+
+def _is_outage(exc: Exception) -> bool:
+    """True for socket / connect failures, which should start the retry cooldown."""
+    return isinstance(exc, (redis.ConnectionError, redis.TimeoutError)) and not _is_pool_exhausted(exc)
+
+
+def _mark_redis_failed(exc: Exception) -> None:
+    """Drop the shared client after a failed command so callers back off.
+
+    The next _get_redis() call returns None until _REDIS_RETRY_INTERVAL has
+    passed, instead of every cache call waiting on socket/pool timeouts.
+    """
+    global _redis_client, _redis_last_fail, _redis_warned
+
+    if _redis_client is not None and not _redis_warned:
+        logger.warning(f"⚠️ Redis command failed – pausing cache for {_REDIS_RETRY_INTERVAL:.0f}s: {exc}")
+        _redis_warned = True
+    _redis_client = None
+    _redis_last_fail = time.time()
+
+
+# Async client for coroutine callers (same pool sizing / cooldown policy as above)
+_async_redis_client: Optional[aioredis.Redis] = None
+_async_redis_last_fail: float = 0.0
+_async_redis_warned: bool = False
+# Serializes first-time setup so concurrent coroutines don't each build (and leak) a pool
+_async_redis_lock = asyncio.Lock()
+
+
+async def _get_async_redis() -> Optional[aioredis.Redis]:
+    """Return an asyncio Redis client, or None if Redis is disabled / unreachable."""
+    global _async_redis_client, _async_redis_last_fail, _async_redis_warned
+
+    if not _SETTINGS_ENABLED:
+        return None
+
+    if _async_redis_client is not None:
+        return _async_redis_client
+
+    async with _async_redis_lock:
+        # Another coroutine may have connected while we waited
+        if _async_redis_client is not None:
+            return _async_redis_client
+
+        now = time.time()
+        if now - _async_redis_last_fail < _REDIS_RETRY_INTERVAL:
+            return None
+
+        pool = None
+        try:
+            pool = aioredis.BlockingConnectionPool.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_POOL_SIZE,
+                timeout=2,
+                decode_responses=False,
+                socket_connect_timeout=3,
+                socket_timeout=2,
+                retry_on_timeout=True,
+                health_check_interval=30,
+            )
+            client = aioredis.Redis(connection_pool=pool)
+            await client.ping()
+            _async_redis_client = client
+            _async_redis_warned = False
+            return client
+        except Exception as e:
+            _async_redis_last_fail = now
+            if pool is not None:
+                await pool.disconnect()
+            if not _async_redis_warned:
+                logger.warning(f"⚠️ Async Redis unavailable – running without cache: {e}")
+                _async_redis_warned = True
+            return None
+
+
+async def _mark_async_redis_failed(exc: Exception) -> None:
+    """Async twin of _mark_redis_failed: drop the client so coroutines back off.
+
+    Each async connect builds its own pool, so the dropped one is disconnected
+    rather than left holding sockets.
+    """
+    global _async_redis_client, _async_redis_last_fail, _async_redis_warned
+
+    client = _async_redis_client
+    _async_redis_client = None
+    _async_redis_last_fail = time.time()
+    if client is None:
+        return
+    if not _async_redis_warned:
+        logger.warning(f"⚠️ Async Redis command failed – pausing cache for {_REDIS_RETRY_INTERVAL:.0f}s: {exc}")
+        _async_redis_warned = True
+    try:
+        await client.connection_pool.disconnect()
+    except Exception:
+        pass
+
+
+# In-process L1 in front of Redis (settings.L1_CACHE_ENABLED). Entries live at
+# most _L1_TTL seconds, which bounds how stale a worker can be after another
+# worker writes or invalidates the same key.
+_L1_MAXSIZE = 1024
+_L1_TTL = 5.0
+
+
+# Bulk deletes: SCAN page size, keys per UNLINK command, UNLINKs per pipeline round-trip
+_SCAN_COUNT = 500
+_DELETE_BATCH = 1000
+_PIPELINE_FLUSH = 10
+
+
+def _delete_scanned(r: redis.Redis, keys) -> int:
+    """Delete every key from an iterable, batching UNLINKs into pipelined round-trips.
+
+    UNLINK frees memory in a Redis background thread instead of blocking the server
+    like DEL does for large values.
+    """
+    deleted = 0
+    batch = []
+    with r.pipeline(transaction=False) as pipe:
+        for k in keys:
+            batch.append(k)
+            if len(batch) >= _DELETE_BATCH:
+                pipe.unlink(*batch)
+                deleted += len(batch)
+                batch = []
+                if len(pipe) >= _PIPELINE_FLUSH:
+                    pipe.execute()
+        if batch:
+            pipe.unlink(*batch)
+            deleted += len(batch)
+        if len(pipe):
+            pipe.execute()
+    return deleted
+
+
+async def _adelete_scanned(r: aioredis.Redis, keys) -> int:
+    """Async twin of _delete_scanned for an async iterable of keys."""
+    deleted = 0
+    batch = []
+    async with r.pipeline(transaction=False) as pipe:
+        async for k in keys:
+            batch.append(k)
+            if len(batch) >= _DELETE_BATCH:
+                pipe.unlink(*batch)
+                deleted += len(batch)
+                batch = []
+                if len(pipe) >= _PIPELINE_FLUSH:
+                    await pipe.execute()
+        if batch:
+            pipe.unlink(*batch)
+            deleted += len(batch)
+        if len(pipe):
+            await pipe.execute()
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Cached DTOs
+# ---------------------------------------------------------------------------
+# Struct values encode as positional msgpack arrays (array_like=True), so field
+# names never hit the wire. Store them with cache.set() and read them back with
+# cache.get_as(); appending fields is fine, reordering needs a new cache key.
+
+class CachedNotification(msgspec.Struct, array_like=True):
+    notification_id: int
+    notification_type: str
+    title: str
+    message: str
+    is_read: bool
+    created_at: str  # ISO-8601, as returned by the API
+
+
 # ---------------------------------------------------------------------------
 # Public cache API
 # ---------------------------------------------------------------------------
@@ -80,44 +326,142 @@ def _get_redis() -> Optional[redis.Redis]:
 class Cache:
     """Thin wrapper with graceful fallback when Redis is down."""
 
+    def __init__(self):
+        self._r: Optional[redis.Redis] = None   # client cached after first lookup
+        # L1 maps key -> (monotonic expiry, msgpack bytes); bytes so hits can't
+        # hand out a shared mutable object
+        self._l1: Optional[TTLCache] = (
+            TTLCache(maxsize=_L1_MAXSIZE, ttl=_L1_TTL) if settings.L1_CACHE_ENABLED else None
+        )
+        self._l1_lock = threading.Lock()
+
+    def _client(self) -> Optional[redis.Redis]:
+        r = self._r or _get_redis()
+        self._r = r
+        return r
+
+    def _drop_client(self, exc: Exception) -> None:
+        """Forget the cached client; socket/connect failures also start the cooldown.
+
+        A full pool keeps the client: the call is just a miss.
+        """
+        if _is_pool_exhausted(exc):
+            return
+        self._r = None
+        if _is_outage(exc):
+            _mark_redis_failed(exc)
+
+    # -- L1 -------------------------------------------------------------------
+
+    def _l1_get(self, key: str) -> Optional[bytes]:
+        with self._l1_lock:
+            entry = self._l1.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def _l1_put(self, key: str, raw: bytes, ttl: float) -> None:
+        """Keep *raw* for min(_L1_TTL, ttl) seconds (ttl <= 0 means no Redis expiry)."""
+        ttl = min(_L1_TTL, ttl) if ttl > 0 else _L1_TTL
+        with self._l1_lock:
+            self._l1[key] = (time.monotonic() + ttl, raw)
+
+    def _l1_evict(self, *keys: str) -> None:
+        with self._l1_lock:
+            for k in keys:
+                self._l1.pop(k, None)
+
+    def _l1_evict_pattern(self, pattern: str) -> None:
+        with self._l1_lock:
+            for k in [k for k in self._l1 if fnmatch.fnmatchcase(k, pattern)]:
+                self._l1.pop(k, None)
+
     # -- core -----------------------------------------------------------------
 
-    def get(self, key: str) -> Optional[Any]:
-        """Fetch a cached value. Returns None on miss or error."""
-        r = _get_redis()
+    def _get_raw(self, key: str) -> Optional[bytes]:
+        """Encoded value from L1 or Redis. Returns None on miss or error."""
+        if self._l1 is not None:
+            raw = self._l1_get(key)
+            if raw is not None:
+                return raw
+        r = self._client()
         if r is None:
             return None
         try:
-            raw = r.get(key)
-            if raw is None:
-                return None
-            return json.loads(raw)
+            if self._l1 is None:
+                return r.get(_key(key))
+            # Fetch the remaining Redis TTL in the same round-trip so the
+            # L1 copy never outlives the Redis one
+            with r.pipeline(transaction=False) as pipe:
+                pipe.get(_key(key))
+                pipe.pttl(_key(key))
+                raw, pttl = pipe.execute()
+            if raw is not None:
+                self._l1_put(key, raw, pttl / 1000)
+            return raw
         except Exception as e:
             logger.debug(f"Cache GET error for {key}: {e}")
+            self._drop_client(e)
+            return None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Fetch a cached value. Returns None on miss or error."""
+        raw = self._get_raw(key)
+        if raw is None:
+            return None
+        try:
+            return _decoder.decode(raw)
+        except Exception as e:
+            logger.debug(f"Cache decode error for {key}: {e}")
+            return None
+
+    def get_as(self, key: str, type_: Type[T]) -> Optional[T]:
+        """Fetch a cached value decoded (and validated) as *type_*.
+
+        Use for values stored as msgspec Structs, e.g.
+        ``cache.get_as(key, list[CachedNotification])``. A value that doesn't
+        match the schema counts as a miss.
+        """
+        raw = self._get_raw(key)
+        if raw is None:
+            return None
+        try:
+            return _typed_decoder(type_).decode(raw)
+        except Exception as e:
+            logger.debug(f"Cache decode error for {key} as {type_}: {e}")
             return None
 
     def set(self, key: str, value: Any, ttl: int = 30) -> bool:
         """Store a value with a TTL (seconds). Returns True on success."""
-        r = _get_redis()
+        if self._l1 is not None:
+            self._l1_evict(key)
+        r = self._client()
         if r is None:
             return False
         try:
-            r.setex(key, ttl, json.dumps(value, default=str))
+            raw = _encoder.encode(value)
+            r.setex(_key(key), ttl, raw)
+            if self._l1 is not None:
+                self._l1_put(key, raw, ttl)
             return True
         except Exception as e:
             logger.debug(f"Cache SET error for {key}: {e}")
+            self._drop_client(e)
             return False
 
-    def delete(self, key: str) -> bool:
-        """Remove a single key."""
-        r = _get_redis()
+    def delete(self, *keys: str) -> bool:
+        """Remove one or more keys in a single round-trip."""
+        if self._l1 is not None:
+            self._l1_evict(*keys)
+        r = self._client()
         if r is None:
             return False
         try:
-            r.delete(key)
+            r.unlink(*[_key(k) for k in keys])
             return True
         except Exception as e:
-            logger.debug(f"Cache DELETE error for {key}: {e}")
+            logger.debug(f"Cache DELETE error for {keys}: {e}")
+            self._drop_client(e)
             return False
 
     def delete_pattern(self, pattern: str) -> int:
@@ -126,22 +470,35 @@ class Cache:
         Uses SCAN so it's safe for production (no KEYS command).
         Returns the number of deleted keys.
         """
-        r = _get_redis()
+        if self._l1 is not None:
+            self._l1_evict_pattern(pattern)
+        r = self._client()
         if r is None:
             return 0
         try:
-            deleted = 0
-            cursor = 0
-            while True:
-                cursor, keys = r.scan(cursor=cursor, match=pattern, count=100)
-                if keys:
-                    r.delete(*keys)
-                    deleted += len(keys)
-                if cursor == 0:
-                    break
-            return deleted
+            return _delete_scanned(r, r.scan_iter(match=_key(pattern), count=_SCAN_COUNT))
         except Exception as e:
             logger.debug(f"Cache DELETE_PATTERN error for {pattern}: {e}")
+            self._drop_client(e)
+            return 0
+
+    def purge_legacy_keys(self) -> int:
+        """Remove keys this app wrote before the msgpack switch (_LEGACY_KEY_PATTERNS).
+
+        One-time rollout helper, run at startup when REDIS_PURGE_LEGACY_KEYS is set.
+        Returns the number of deleted keys.
+        """
+        r = self._client()
+        if r is None:
+            return 0
+        try:
+            return sum(
+                _delete_scanned(r, r.scan_iter(match=pattern, count=_SCAN_COUNT))
+                for pattern in _LEGACY_KEY_PATTERNS
+            )
+        except Exception as e:
+            logger.debug(f"Cache PURGE_LEGACY error: {e}")
+            self._drop_client(e)
             return 0
 
     # -- helpers --------------------------------------------------------------
@@ -158,18 +515,116 @@ class Cache:
     # -- health ---------------------------------------------------------------
 
     def ping(self) -> bool:
-        r = _get_redis()
+        r = self._client()
         if r is None:
             return False
         try:
             return r.ping()
-        except Exception:
+        except Exception as e:
+            self._drop_client(e)
             return False
 
     @property
     def enabled(self) -> bool:
-        return settings.REDIS_ENABLED and _get_redis() is not None
+        return _SETTINGS_ENABLED and self._client() is not None
+
+
+class AsyncCache:
+    """asyncio counterpart of :class:`Cache` for use inside ``async def`` routes.
+
+    Same key scheme, encoding and graceful fallback; every call awaits the
+    Redis round-trip instead of blocking the event loop.
+    """
+
+    @staticmethod
+    async def _on_error(exc: Exception) -> None:
+        """Start the retry cooldown for socket/connect failures (a full pool is just a miss)."""
+        if _is_outage(exc):
+            await _mark_async_redis_failed(exc)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Fetch a cached value. Returns None on miss or error."""
+        r = await _get_async_redis()
+        if r is None:
+            return None
+        try:
+            raw = await r.get(_key(key))
+            if raw is None:
+                return None
+            return _decoder.decode(raw)
+        except Exception as e:
+            logger.debug(f"Async cache GET error for {key}: {e}")
+            await self._on_error(e)
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int = 30) -> bool:
+        """Store a value with a TTL (seconds). Returns True on success."""
+        r = await _get_async_redis()
+        if r is None:
+            return False
+        try:
+            await r.setex(_key(key), ttl, _encoder.encode(value))
+            return True
+        except Exception as e:
+            logger.debug(f"Async cache SET error for {key}: {e}")
+            await self._on_error(e)
+            return False
+
+    async def delete(self, *keys: str) -> bool:
+        """Remove one or more keys in a single round-trip."""
+        r = await _get_async_redis()
+        if r is None:
+            return False
+        try:
+            await r.unlink(*[_key(k) for k in keys])
+            return True
+        except Exception as e:
+            logger.debug(f"Async cache DELETE error for {keys}: {e}")
+            await self._on_error(e)
+            return False
+
+    async def delete_pattern(self, pattern: str) -> int:
+        """Remove all keys matching a glob pattern. Returns the number of deleted keys."""
+        r = await _get_async_redis()
+        if r is None:
+            return 0
+        try:
+            return await _adelete_scanned(r, r.scan_iter(match=_key(pattern), count=_SCAN_COUNT))
+        except Exception as e:
+            logger.debug(f"Async cache DELETE_PATTERN error for {pattern}: {e}")
+            await self._on_error(e)
+            return 0
+
+    async def get_or_set(self, key: str, factory, ttl: int = 30) -> Any:
+        """Return cached value or call *factory()* to compute & cache it.
+
+        *factory* may be a plain callable or return an awaitable.
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        value = factory()
+        if inspect.isawaitable(value):
+            value = await value
+        await self.set(key, value, ttl=ttl)
+        return value
+
+    async def pipeline(self):
+        """Return a non-transactional pipeline for multi-key work, or None if Redis is down.
+
+        Keys passed to the pipeline are raw Redis keys; wrap them with ``cache_key()``.
+        """
+        r = await _get_async_redis()
+        if r is None:
+            return None
+        return r.pipeline(transaction=False)
+
+
+def cache_key(key: str) -> str:
+    """Full Redis key for a cache key (for callers that talk to a pipeline directly)."""
+    return _key(key)
 
 
-# Module-level singleton – import this everywhere
+# Module-level singletons – import these everywhere
 cache = Cache()
+async_cache = AsyncCache()
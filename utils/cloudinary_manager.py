@@ -8,8 +8,11 @@ import cloudinary.uploader
 import cloudinary.api
 from fastapi import UploadFile, HTTPException, status
 from config import settings
+import asyncio
+import functools
 import logging
 import io
+import re
 from typing import Optional
 
 # Set up logging
@@ -22,6 +25,36 @@ cloudinary.config(
     api_secret=settings.CLOUDINARY_API_SECRET
 )
 
+# Matches delivery URLs such as
+# https://res.cloudinary.com/drw82hgul/image/upload/v1234567890/pasugo/riders/file.jpg
+_PUBLIC_ID_RE = re.compile(
+    r"cloudinary\.com/[^/]+/(?:image|video|raw)/upload/(?:v\d+/)?"
+    r"(?P<pid>[^?#]+?)(?:\.[^./?#]+)?(?:[?#].*)?$"
+)
+
+# Chunk size for streamed uploads (Cloudinary requires at least 5MB per chunk)
+UPLOAD_CHUNK_SIZE = 6_000_000
+
+
+@functools.lru_cache(maxsize=4096)
+def _build_thumb(public_id: str, width: int, height: int) -> str:
+    """Build (and memoize) a secure thumbnail URL"""
+    return cloudinary.CloudinaryResource(public_id).build_url(
+        secure=True,
+        width=width,
+        height=height,
+        crop="fill",
+        gravity="auto"
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _build_url(public_id: str, transformations: frozenset = frozenset()) -> str:
+    """Build (and memoize) a secure URL; transformations are frozen dict items"""
+    options = {"secure": True}
+    options.update(transformations)
+    return cloudinary.CloudinaryResource(public_id).build_url(**options)
+
 
 class CloudinaryManager:
     """Manager for all Cloudinary operations"""
@@ -49,9 +82,9 @@ class CloudinaryManager:
             HTTPException if upload fails
         """
         try:
-            # Validate file size
-            contents = await file.read()
-            if len(contents) > settings.MAX_UPLOAD_SIZE:
+            # Validate file size without buffering the body in memory
+            size = CloudinaryManager._upload_size(file)
+            if size > settings.MAX_UPLOAD_SIZE:
                 raise HTTPException(
                     status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                     detail=f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB"
@@ -64,9 +97,6 @@ class CloudinaryManager:
                 "document": ["application/pdf", "application/msword"]
             }
             
-            # Reset file pointer after reading
-            await file.seek(0)
-            
             # Determine resource type and validate
             if file.content_type and file.content_type.startswith("image/"):
                 resource_type = "image"
@@ -78,8 +108,12 @@ class CloudinaryManager:
             # Upload to Cloudinary
             full_folder = f"{settings.CLOUDINARY_FOLDER_PREFIX}/{folder}"
             
-            response = cloudinary.uploader.upload(
-                contents,
+            # Stream the spooled file in chunks instead of a single bytes copy;
+            # the SDK call blocks, so run it off the event loop
+            response = await asyncio.to_thread(
+                cloudinary.uploader.upload_large,
+                file.file,
+                chunk_size=UPLOAD_CHUNK_SIZE,
                 folder=full_folder,
                 public_id=public_id,
                 resource_type=resource_type,
@@ -109,6 +143,24 @@ class CloudinaryManager:
                 detail=f"File upload failed: {str(e)}"
             )
     
+    @staticmethod
+    def _upload_size(file: UploadFile) -> int:
+        """
+        Size of an UploadFile in bytes, without reading it
+        
+        Uses the size reported by Starlette when available; otherwise seeks
+        the underlying spooled file to its end and back.
+        """
+        if file.size is not None:
+            return file.size
+        
+        handle = file.file
+        start = handle.tell()
+        handle.seek(0, io.SEEK_END)
+        size = handle.tell()
+        handle.seek(start)
+        return size
+    
     @staticmethod
     def delete_file(public_id: str, resource_type: str = "image") -> bool:
         """
@@ -123,6 +175,9 @@ class CloudinaryManager:
         """
         try:
             result = cloudinary.uploader.destroy(public_id, resource_type=resource_type)
+            # Cached URLs may point at the deleted asset
+            _build_thumb.cache_clear()
+            _build_url.cache_clear()
             if result.get("result") == "ok":
                 logger.info(f"File deleted successfully: {public_id}")
                 return True
@@ -133,6 +188,11 @@ class CloudinaryManager:
             logger.error(f"Error deleting file {public_id}: {str(e)}", exc_info=True)
             return False
     
+    @staticmethod
+    async def delete_file_async(public_id: str, resource_type: str = "image") -> bool:
+        """Non-blocking delete_file for async route handlers"""
+        return await asyncio.to_thread(CloudinaryManager.delete_file, public_id, resource_type)
+    
     @staticmethod
     def get_file_url(public_id: str, transformations: Optional[dict] = None) -> str:
         """
@@ -146,18 +206,14 @@ class CloudinaryManager:
             Secure URL of the file
         """
         try:
-            # Build transformation options
-            options = {
-                "secure": True
-            }
-            
-            if transformations:
-                # Example transformations:
-                # {"width": 300, "height": 300, "crop": "fill"}
-                options.update(transformations)
-            
-            url = cloudinary.CloudinaryResource(public_id).build_url(**options)
-            return url
+            # Example transformations:
+            # {"width": 300, "height": 300, "crop": "fill"}
+            try:
+                key = frozenset((transformations or {}).items())
+            except TypeError:
+                # Unhashable (nested) transformation values can't be cached
+                return _build_url.__wrapped__(public_id, transformations.items())
+            return _build_url(public_id, key)
         except Exception as e:
             logger.error(f"Error generating URL for {public_id}: {str(e)}")
             return None
@@ -176,14 +232,7 @@ class CloudinaryManager:
             Secure URL of the thumbnail
         """
         try:
-            url = cloudinary.CloudinaryResource(public_id).build_url(
-                secure=True,
-                width=width,
-                height=height,
-                crop="fill",
-                gravity="auto"
-            )
-            return url
+            return _build_thumb(public_id, width, height)
         except Exception as e:
             logger.error(f"Error generating thumbnail for {public_id}: {str(e)}")
             return None
@@ -237,25 +286,8 @@ class CloudinaryManager:
         Returns:
             Public ID or None if not a Cloudinary URL
         """
-        try:
-            # Example URL: https://res.cloudinary.com/drw82hgul/image/upload/v1234567890/pasugo/riders/file.jpg
-            if "cloudinary.com" not in url:
-                return None
-            
-            # Extract public_id from URL
-            parts = url.split("/upload/")
-            if len(parts) < 2:
-                return None
-            
-            # Get path after /upload/
-            path = parts[1]
-            # Remove file extension and version info
-            public_id = "/".join(path.split("/")[1:]).rsplit(".", 1)[0]
-            
-            return public_id
-        except Exception as e:
-            logger.error(f"Error extracting public_id from URL: {str(e)}")
-            return None
+        m = _PUBLIC_ID_RE.search(url)
+        return m.group("pid") if m else None
     
     @staticmethod
     def health_check() -> bool:
@@ -276,6 +308,11 @@ class CloudinaryManager:
         except Exception as e:
             logger.error(f"Cloudinary connection error: {str(e)}")
             return False
+    
+    @staticmethod
+    async def health_check_async() -> bool:
+        """Non-blocking health_check for async route handlers"""
+        return await asyncio.to_thread(CloudinaryManager.health_check)
 
 
 # Convenience functions
@@ -3,11 +3,17 @@
 # Calculates driving distance between two GPS coordinates
 # Used to auto-compute rider service fees
 
+import bisect
 import logging
 import math
 from typing import Optional, Tuple
 from decimal import Decimal
 
+import httpx
+import numpy as np
+
+from config import settings
+
 logger = logging.getLogger(__name__)
 
 # Service fee tiers (distance in km -> fee in pesos)
@@ -20,6 +26,22 @@ SERVICE_FEE_TIERS = [
 FEE_PER_EXTRA_BRACKET = Decimal("30.00")
 BRACKET_SIZE_KM = 3
 
+# Integer-centavo lookup tables derived from the tiers above (no Decimal math per call)
+_TIER_MAX_KM = [km for km, _ in SERVICE_FEE_TIERS]
+_TIER_FEE_CENTS = [int(fee * 100) for _, fee in SERVICE_FEE_TIERS]
+_EXTRA_BRACKET_CENTS = int(FEE_PER_EXTRA_BRACKET * 100)
+TIER_MAX_KM = np.array(_TIER_MAX_KM, dtype=np.float64)
+TIER_FEE_CENTS = np.array(_TIER_FEE_CENTS, dtype=np.int64)
+
+
+def _fee_cents(distance_km: float) -> int:
+    """Service fee in centavos for a single distance."""
+    idx = bisect.bisect_left(_TIER_MAX_KM, distance_km)
+    if idx < len(_TIER_MAX_KM):
+        return _TIER_FEE_CENTS[idx]
+    extra_brackets = math.ceil((distance_km - _TIER_MAX_KM[-1]) / BRACKET_SIZE_KM)
+    return _TIER_FEE_CENTS[-1] + _EXTRA_BRACKET_CENTS * extra_brackets
+
 
 def calculate_service_fee(distance_km: float) -> Decimal:
     """
@@ -34,19 +56,23 @@ def calculate_service_fee(distance_km: float) -> Decimal:
     
     Minimum fee is ₱30 (even for <1 km).
     """
-    if distance_km <= 0:
-        return SERVICE_FEE_TIERS[0][1]  # Minimum ₱30
+    return Decimal(_fee_cents(distance_km)).scaleb(-2)
 
-    for max_km, fee in SERVICE_FEE_TIERS:
-        if distance_km <= max_km:
-            return fee
 
-    # Beyond the last tier: calculate extra brackets
-    last_tier_km = SERVICE_FEE_TIERS[-1][0]
-    last_tier_fee = SERVICE_FEE_TIERS[-1][1]
-    extra_km = distance_km - last_tier_km
-    extra_brackets = math.ceil(extra_km / BRACKET_SIZE_KM)
-    return last_tier_fee + (FEE_PER_EXTRA_BRACKET * extra_brackets)
+def calculate_service_fees_batch(distances_km) -> np.ndarray:
+    """
+    Vectorized calculate_service_fee for many distances at once
+    (e.g. when ranking candidate riders).
+
+    Returns an int64 array of fees in centavos, aligned with *distances_km*.
+    """
+    d = np.asarray(distances_km, dtype=np.float64)
+    idx = np.searchsorted(TIER_MAX_KM, d, side="left")
+    in_tiers = idx < len(TIER_MAX_KM)
+    tier_fee = TIER_FEE_CENTS[np.minimum(idx, len(TIER_MAX_KM) - 1)]
+    extra_brackets = np.ceil((d - TIER_MAX_KM[-1]) / BRACKET_SIZE_KM).astype(np.int64)
+    beyond_fee = TIER_FEE_CENTS[-1] + _EXTRA_BRACKET_CENTS * extra_brackets
+    return np.where(in_tiers, tier_fee, beyond_fee)
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -67,6 +93,100 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+def haversine_distance_bulk(
+    lat1: float,
+    lon1: float,
+    lats2: np.ndarray,
+    lons2: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized haversine_distance from one point to many points (in km).
+    Used when ranking many candidate riders against a single customer location.
+    """
+    R = 6371  # Earth's radius in km
+    lat1_rad = math.radians(lat1)
+    lats2_rad = np.radians(lats2)
+    d_lat = lats2_rad - lat1_rad
+    d_lon = np.radians(lons2) - math.radians(lon1)
+    a = (
+        np.sin(d_lat / 2) ** 2
+        + math.cos(lat1_rad)
+        * np.cos(lats2_rad)
+        * np.sin(d_lon / 2) ** 2
+    )
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
+
+
+# OpenRouteService directions endpoint; coordinates are [longitude, latitude]
+ORS_DIRECTIONS_URL = "https://api.openrouteservice.org/v2/directions/driving-car"
+
+# Shared keep-alive client so each fee lookup reuses a pooled HTTP/2 connection
+# instead of paying a fresh TCP+TLS handshake
+_ORS_CLIENT = httpx.Client(
+    http2=True,
+    timeout=8.0,
+    limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+    headers={"Accept": "application/json"},
+)
+
+
+def _ors_request(
+    origin_lat: float,
+    origin_lng: float,
+    dest_lat: float,
+    dest_lng: float,
+) -> Tuple[dict, dict]:
+    """Headers and JSON body for an ORS directions request."""
+    api_key = settings.ORS_API_KEY
+    if not api_key:
+        raise ValueError("ORS_API_KEY not configured")
+
+    headers = {
+        "Authorization": api_key,
+        "Content-Type": "application/json",
+    }
+    body = {
+        "coordinates": [
+            [origin_lng, origin_lat],
+            [dest_lng, dest_lat],
+        ]
+    }
+    return headers, body
+
+
+def _parse_ors_route(
+    data: dict,
+    origin_lat: float,
+    origin_lng: float,
+    dest_lat: float,
+    dest_lng: float,
+) -> Tuple[float, float]:
+    """(distance_km, duration_minutes) from an ORS directions response."""
+    route = data["routes"][0]["summary"]
+    distance_km = route["distance"] / 1000  # meters -> km
+    duration_min = route["duration"] / 60    # seconds -> minutes
+
+    logger.info(
+        f"ORS distance: {distance_km:.2f} km, duration: {duration_min:.1f} min "
+        f"({origin_lat},{origin_lng} -> {dest_lat},{dest_lng})"
+    )
+    return distance_km, duration_min
+
+
+def _haversine_fallback(
+    origin_lat: float,
+    origin_lng: float,
+    dest_lat: float,
+    dest_lng: float,
+) -> Tuple[float, None]:
+    straight = haversine_distance(origin_lat, origin_lng, dest_lat, dest_lng)
+    # Multiply by 1.3 to approximate road distance
+    approx = straight * 1.3
+    logger.info(f"Haversine fallback: {straight:.2f} km straight, {approx:.2f} km approx road")
+    return approx, None
+
+
 def get_driving_distance(
     origin_lat: float,
     origin_lng: float,
@@ -81,48 +201,14 @@ def get_driving_distance(
     Falls back to haversine * 1.3 if ORS API is unreachable.
     """
     try:
-        import httpx
-        from config import settings
-
-        api_key = settings.ORS_API_KEY
-        if not api_key:
-            raise ValueError("ORS_API_KEY not configured")
-
-        # ORS expects coordinates as [longitude, latitude]
-        url = "https://api.openrouteservice.org/v2/directions/driving-car"
-        headers = {
-            "Authorization": api_key,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        body = {
-            "coordinates": [
-                [origin_lng, origin_lat],
-                [dest_lng, dest_lat],
-            ]
-        }
-
-        resp = httpx.post(url, json=body, headers=headers, timeout=8.0)
+        headers, body = _ors_request(origin_lat, origin_lng, dest_lat, dest_lng)
+        resp = _ORS_CLIENT.post(ORS_DIRECTIONS_URL, json=body, headers=headers)
         resp.raise_for_status()
-        data = resp.json()
-
-        route = data["routes"][0]["summary"]
-        distance_km = route["distance"] / 1000  # meters -> km
-        duration_min = route["duration"] / 60    # seconds -> minutes
-
-        logger.info(
-            f"ORS distance: {distance_km:.2f} km, duration: {duration_min:.1f} min "
-            f"({origin_lat},{origin_lng} -> {dest_lat},{dest_lng})"
-        )
-        return distance_km, duration_min
+        return _parse_ors_route(resp.json(), origin_lat, origin_lng, dest_lat, dest_lng)
 
     except Exception as e:
         logger.warning(f"ORS API failed, falling back to haversine: {e}")
-        straight = haversine_distance(origin_lat, origin_lng, dest_lat, dest_lng)
-        # Multiply by 1.3 to approximate road distance
-        approx = straight * 1.3
-        logger.info(f"Haversine fallback: {straight:.2f} km straight, {approx:.2f} km approx road")
-        return approx, None
+        return _haversine_fallback(origin_lat, origin_lng, dest_lat, dest_lng)
 
 
 def compute_fee_between(
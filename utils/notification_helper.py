@@ -5,9 +5,28 @@ from sqlalchemy.orm import Session
 from models.notification import Notification, NotificationType
 from utils.cache import cache
 
+# Message templates with currency amounts (%-formatted)
+_BILL_SUBMITTED_TPL = "Your rider submitted the bill. Total: ₱%.2f. Please review and pay."
+_PAYMENT_RECEIVED_TPL = "Customer submitted payment of ₱%.2f. Please confirm."
 
-def create_notification(db: Session, user_id: int, notification_type: str, title: str, message: str, reference_id: int = None, reference_type: str = None):
-    """Create a notification for a user"""
+
+def invalidate_notification_caches(*user_ids: int):
+    """Drop cached unread counts and lists for the given users"""
+    keys = []
+    for user_id in user_ids:
+        keys.append(f"notifications:unread:{user_id}")
+        keys.append(f"notifications:list:{user_id}")
+    cache.delete(*keys)
+
+
+def create_notification(db: Session, user_id: int, notification_type: str, title: str, message: str, reference_id: int = None, reference_type: str = None, commit: bool = True):
+    """Create a notification for a user
+
+    With commit=False the row is only flushed, so it joins the caller's
+    transaction and is persisted by the caller's own db.commit(). The caller
+    must then call invalidate_notification_caches(user_id) after committing;
+    invalidating before the commit would let a poll re-cache the old list.
+    """
     notif = Notification(
         user_id=user_id,
         notification_type=notification_type,
@@ -17,16 +36,17 @@ def create_notification(db: Session, user_id: int, notification_type: str, title
         reference_type=reference_type
     )
     db.add(notif)
-    db.commit()
-    
-    # Invalidate notification caches for this user
-    cache.delete(f"notifications:unread:{user_id}")
-    cache.delete(f"notifications:list:{user_id}")
+    if commit:
+        db.commit()
+        # Invalidate notification caches for this user
+        invalidate_notification_caches(user_id)
+    else:
+        db.flush()
     
     return notif
 
 
-def notify_rider_selected(db: Session, rider_user_id: int, request_id: int, customer_name: str, service_type: str):
+def notify_rider_selected(db: Session, rider_user_id: int, request_id: int, customer_name: str, service_type: str, commit: bool = True):
     """Notify rider they have been selected for a request"""
     return create_notification(
         db=db,
@@ -35,11 +55,12 @@ def notify_rider_selected(db: Session, rider_user_id: int, request_id: int, cust
         title="New Request For You!",
         message=f"{customer_name} selected you for a {service_type} request. Accept within 10 minutes!",
         reference_id=request_id,
-        reference_type="request"
+        reference_type="request",
+        commit=commit
     )
 
 
-def notify_rider_accepted(db: Session, customer_user_id: int, request_id: int, rider_name: str):
+def notify_rider_accepted(db: Session, customer_user_id: int, request_id: int, rider_name: str, commit: bool = True):
     """Notify customer that rider accepted their request"""
     return create_notification(
         db=db,
@@ -48,11 +69,12 @@ def notify_rider_accepted(db: Session, customer_user_id: int, request_id: int, r
         title="Rider Accepted!",
         message=f"{rider_name} has accepted your request and is on the way!",
         reference_id=request_id,
-        reference_type="request"
+        reference_type="request",
+        commit=commit
     )
 
 
-def notify_delivery_started(db: Session, customer_user_id: int, request_id: int, rider_name: str):
+def notify_delivery_started(db: Session, customer_user_id: int, request_id: int, rider_name: str, commit: bool = True):
     """Notify customer that delivery has started"""
     return create_notification(
         db=db,
@@ -61,11 +83,12 @@ def notify_delivery_started(db: Session, customer_user_id: int, request_id: int,
         title="Delivery Started!",
         message=f"{rider_name} has started delivering your items!",
         reference_id=request_id,
-        reference_type="request"
+        reference_type="request",
+        commit=commit
     )
 
 
-def notify_delivery_completed(db: Session, customer_user_id: int, request_id: int):
+def notify_delivery_completed(db: Session, customer_user_id: int, request_id: int, commit: bool = True):
     """Notify customer that delivery is completed"""
     return create_notification(
         db=db,
@@ -74,37 +97,40 @@ def notify_delivery_completed(db: Session, customer_user_id: int, request_id: in
         title="Delivery Completed!",
         message="Your delivery has been completed. Please rate your rider!",
         reference_id=request_id,
-        reference_type="request"
+        reference_type="request",
+        commit=commit
     )
 
 
-def notify_bill_submitted(db: Session, customer_user_id: int, request_id: int, total_amount: float):
+def notify_bill_submitted(db: Session, customer_user_id: int, request_id: int, total_amount: float, commit: bool = True):
     """Notify customer that rider submitted the bill"""
     return create_notification(
         db=db,
         user_id=customer_user_id,
         notification_type="payment_confirmation",
         title="Bill Submitted",
-        message=f"Your rider submitted the bill. Total: ₱{total_amount:.2f}. Please review and pay.",
+        message=_BILL_SUBMITTED_TPL % total_amount,
         reference_id=request_id,
-        reference_type="request"
+        reference_type="request",
+        commit=commit
     )
 
 
-def notify_payment_received(db: Session, rider_user_id: int, request_id: int, amount: float):
+def notify_payment_received(db: Session, rider_user_id: int, request_id: int, amount: float, commit: bool = True):
     """Notify rider that payment was submitted"""
     return create_notification(
         db=db,
         user_id=rider_user_id,
         notification_type="payment_confirmation",
         title="Payment Submitted",
-        message=f"Customer submitted payment of ₱{amount:.2f}. Please confirm.",
+        message=_PAYMENT_RECEIVED_TPL % amount,
         reference_id=request_id,
-        reference_type="request"
+        reference_type="request",
+        commit=commit
     )
 
 
-def notify_payment_confirmed(db: Session, customer_user_id: int, request_id: int):
+def notify_payment_confirmed(db: Session, customer_user_id: int, request_id: int, commit: bool = True):
     """Notify customer that rider confirmed payment"""
     return create_notification(
         db=db,
@@ -113,11 +139,12 @@ def notify_payment_confirmed(db: Session, customer_user_id: int, request_id: int
         title="Payment Confirmed!",
         message="Your payment has been confirmed by the rider. Thank you!",
         reference_id=request_id,
-        reference_type="request"
+        reference_type="request",
+        commit=commit
     )
 
 
-def notify_request_cancelled(db: Session, user_id: int, request_id: int, cancelled_by: str):
+def notify_request_cancelled(db: Session, user_id: int, request_id: int, cancelled_by: str, commit: bool = True):
     """Notify about request cancellation"""
     return create_notification(
         db=db,
@@ -126,5 +153,6 @@ def notify_request_cancelled(db: Session, user_id: int, request_id: int, cancell
         title="Request Cancelled",
         message=f"The request has been cancelled by the {cancelled_by}.",
         reference_id=request_id,
-        reference_type="request"
+        reference_type="request",
+        commit=commit
     )
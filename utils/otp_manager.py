@@ -1,6 +1,6 @@
-import random
-import string
-from datetime import datetime, timedelta
+import secrets
+import time
+from datetime import datetime, timezone
 from typing import Tuple, Optional
 import logging
 
@@ -11,21 +11,23 @@ class OTPManager:
     """Manages OTP generation and validation for FastAPI"""
     
     OTP_LENGTH = 6
+    OTP_SPACE = 10 ** OTP_LENGTH  # number of possible codes at the default length
     OTP_EXPIRY_MINUTES = 10
     MAX_ATTEMPTS = 5
     
     @staticmethod
     def generate_otp(length: int = OTP_LENGTH) -> str:
         """
-        Generate a random OTP code
+        Generate a cryptographically secure random OTP code
         
         Args:
             length: Length of OTP (default 6 digits)
         
         Returns:
-            String containing random digits
+            String containing random digits (zero-padded)
         """
-        return ''.join(random.choices(string.digits, k=length))
+        space = OTPManager.OTP_SPACE if length == OTPManager.OTP_LENGTH else 10 ** length
+        return f"{secrets.randbelow(space):0{length}d}"
     
     @staticmethod
     def get_expiry_time(minutes: int = OTP_EXPIRY_MINUTES) -> datetime:
@@ -38,7 +40,22 @@ class OTPManager:
         Returns:
             DateTime object for expiry
         """
-        return datetime.utcnow() + timedelta(minutes=minutes)
+        return datetime.fromtimestamp(
+            OTPManager.get_expiry_epoch(minutes), timezone.utc
+        ).replace(tzinfo=None)  # DB column is naive UTC
+    
+    @staticmethod
+    def get_expiry_epoch(minutes: int = OTP_EXPIRY_MINUTES) -> float:
+        """
+        Calculate OTP expiry as a Unix timestamp
+        
+        Args:
+            minutes: Minutes until expiry (default 10)
+        
+        Returns:
+            Seconds since the epoch when the OTP expires
+        """
+        return time.time() + minutes * 60
     
     @staticmethod
     def is_otp_expired(expires_at: datetime) -> bool:
@@ -46,12 +63,28 @@ class OTPManager:
         Check if OTP has expired
         
         Args:
-            expires_at: DateTime when OTP expires
+            expires_at: DateTime (naive UTC) when OTP expires
+        
+        Returns:
+            True if expired, False otherwise
+        """
+        return OTPManager.is_otp_expired_epoch(
+            expires_at.replace(tzinfo=timezone.utc).timestamp()
+        )
+    
+    @staticmethod
+    def is_otp_expired_epoch(expires_at_epoch: float) -> bool:
+        """
+        Check if OTP has expired using a Unix timestamp
+        
+        Args:
+            expires_at_epoch: Seconds since the epoch when OTP expires
+                (see OTP.expires_at_epoch)
         
         Returns:
             True if expired, False otherwise
         """
-        return datetime.utcnow() > expires_at
+        return time.time() > expires_at_epoch
     
     @staticmethod
     def can_attempt(attempts: int, max_attempts: int = MAX_ATTEMPTS) -> bool:
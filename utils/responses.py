@@ -1,5 +1,6 @@
 from typing import Any, Optional
 from fastapi.responses import JSONResponse
+from .orjson_response import ORJSONResponse
 
 
 def success_response(
@@ -8,7 +9,7 @@ def success_response(
     status_code: int = 200
 ) -> JSONResponse:
     """Standard success response"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={
             "success": True,
@@ -18,6 +19,19 @@ def success_response(
     )
 
 
+def success_dict(data: Any = None, message: str = "Success") -> dict:
+    """Standard success payload as a plain dict
+
+    Return this from routes that don't need a custom status code; FastAPI
+    serializes it once through the default response class.
+    """
+    return {
+        "success": True,
+        "message": message,
+        "data": data
+    }
+
+
 def error_response(
     message: str = "Error occurred",
     errors: Optional[Any] = None,
@@ -32,7 +46,7 @@ def error_response(
     if errors:
         content["errors"] = errors
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=content
     )
@@ -46,7 +60,7 @@ def paginated_response(
     message: str = "Success"
 ) -> JSONResponse:
     """Paginated response"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "success": True,
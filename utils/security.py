@@ -1,47 +1,186 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
-from jose import JWTError, jwt
+import jwt
+import orjson
+from jwt.exceptions import InvalidTokenError
+import base64
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
 from config import settings
 from fastapi import HTTPException, status
 
+logger = logging.getLogger(__name__)
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt
+__all__ = [
+    "hash_password",
+    "verify_password",
+    "password_needs_rehash",
+    "create_access_token",
+    "create_refresh_token",
+    "verify_token",
+    "verify_token_silent",
+    "verify_tokens_batch",
+    "generate_otp",
+    "validate_password_strength",
+]
+
+# Candidate bcrypt costs for auto-tuning (each step doubles the work)
+_MIN_BCRYPT_COST = 10
+_MAX_BCRYPT_COST = 14
+
+
+def _calibrate_bcrypt_cost(target_ms: int = 250) -> int:
+    """Pick the smallest bcrypt cost whose hash takes at least target_ms here
     
-    Bcrypt has a maximum password length of 72 bytes.
-    Passwords longer than 72 bytes are truncated.
+    Stops at the first cost that meets the target, so startup pays for at
+    most a couple of target-length hashes. Falls back to the maximum cost
+    on hardware fast enough to beat the target at every candidate.
     """
-    # Convert to bytes and truncate to 72 bytes
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
+    for cost in range(_MIN_BCRYPT_COST, _MAX_BCRYPT_COST + 1):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"x" * 16, bcrypt.gensalt(cost))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= target_ms:
+            break
+    logger.info(f"bcrypt cost calibrated to {cost} ({elapsed_ms:.0f} ms per hash)")
+    return cost
+
+
+_USE_ARGON2 = settings.PASSWORD_HASH_SCHEME != "bcrypt"
+
+# Work factor for new bcrypt hashes; existing hashes carry their own cost.
+# Only calibrated when bcrypt is the active scheme.
+_BCRYPT_COST = settings.BCRYPT_ROUNDS or (
+    _calibrate_bcrypt_cost(settings.BCRYPT_TARGET_MS) if not _USE_ARGON2 else 12
+)
+
+# Argon2id hasher (parameters are embedded in each hash, like bcrypt's cost)
+_argon2 = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+def _bcrypt_bytes(password: str) -> bytes:
+    """Password as bcrypt input
+    
+    Bcrypt has a maximum password length of 72 bytes; longer passwords are
+    truncated. 72 characters always cover the first 72 bytes, so only that
+    prefix gets encoded.
+    """
+    return password[:72].encode('utf-8')[:72]
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with the configured scheme (argon2id by default)"""
+    if _USE_ARGON2:
+        return _argon2.hash(password)
     
     # Generate salt and hash
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    salt = bcrypt.gensalt(_BCRYPT_COST)
+    hashed = bcrypt.hashpw(_bcrypt_bytes(password), salt)
     
     # Return as string
     return hashed.decode('utf-8')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash
+    """Verify a password against an argon2 or bcrypt hash"""
+    if isinstance(hashed_password, bytes):
+        hashed_password = hashed_password.decode('utf-8')
+    
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return bcrypt.checkpw(_bcrypt_bytes(plain_password), hashed_password.encode('utf-8'))
+    
+    try:
+        return _argon2.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if a stored hash should be replaced after a successful login
     
-    Bcrypt has a maximum password length of 72 bytes.
-    Passwords longer than 72 bytes are truncated for verification.
+    Covers hashes from the other scheme (e.g. legacy bcrypt once argon2 is
+    active) and argon2 hashes made with outdated parameters.
     """
-    # Convert password to bytes and truncate to 72 bytes
-    password_bytes = plain_password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
+    is_bcrypt = hashed_password.startswith(_BCRYPT_PREFIXES)
+    if not _USE_ARGON2:
+        return not is_bcrypt
+    if is_bcrypt:
+        return True
+    try:
+        return _argon2.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+
+def _load_jwt_keys():
+    """(signing key, verification key) for settings.ALGORITHM
+    
+    HS256 signs and verifies with SECRET_KEY. EdDSA signs with the Ed25519
+    private key and verifies with the public key, so services that only
+    check tokens never need the signing secret.
+    """
+    if settings.ALGORITHM != "EdDSA":
+        return settings.SECRET_KEY, settings.SECRET_KEY
+    
+    if not settings.JWT_PRIVATE_KEY or not settings.JWT_PUBLIC_KEY:
+        raise RuntimeError("JWT_PRIVATE_KEY and JWT_PUBLIC_KEY are required for EdDSA tokens")
+    private_key = serialization.load_pem_private_key(settings.JWT_PRIVATE_KEY.encode(), password=None)
+    public_key = serialization.load_pem_public_key(settings.JWT_PUBLIC_KEY.encode())
+    if not isinstance(private_key, ed25519.Ed25519PrivateKey) or not isinstance(public_key, ed25519.Ed25519PublicKey):
+        raise RuntimeError("JWT_PRIVATE_KEY / JWT_PUBLIC_KEY must be Ed25519 keys")
+    return private_key, public_key
+
+
+_JWT_SIGNING_KEY, _JWT_VERIFY_KEY = _load_jwt_keys()
+
+
+# HS256 key material derived once: the pre-keyed HMAC object already holds the
+# ipad/opad state, so each sign or verify only copies it instead of re-keying
+_HMAC_KEY = settings.SECRET_KEY.encode()
+_HMAC_SHA256 = hmac.new(_HMAC_KEY, digestmod=hashlib.sha256)
+
+# Every token we mint carries these
+_REQUIRED_CLAIMS = ("exp", "iat")
+
+
+def _b64url_encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+# Every HS256 token shares the same header segment
+_HS256_HEADER_B64 = _b64url_encode(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+
+def _encode_token(claims: dict) -> str:
+    """Sign claims as a compact JWT
     
-    # Convert hash to bytes if it's a string
-    if isinstance(hashed_password, str):
-        hashed_password = hashed_password.encode('utf-8')
+    HS256 tokens are serialized with orjson and signed with the pre-keyed
+    HMAC; other algorithms go through PyJWT.
+    """
+    if settings.ALGORITHM != "HS256":
+        return jwt.encode(claims, _JWT_SIGNING_KEY, algorithm=settings.ALGORITHM)
     
-    # Verify
-    return bcrypt.checkpw(password_bytes, hashed_password)
+    signing_input = f"{_HS256_HEADER_B64}.{_b64url_encode(orjson.dumps(claims))}"
+    mac = _HMAC_SHA256.copy()
+    mac.update(signing_input.encode())
+    return f"{signing_input}.{_b64url_encode(mac.digest())}"
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -56,19 +195,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     to_encode = data.copy()
     
+    # NumericDate claims (RFC 7519) as plain ints, from a single clock read
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        lifetime = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
     to_encode.update({
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + lifetime,
+        "iat": now,
         "type": "access"
     })
     
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    return _encode_token(to_encode)
 
 
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -83,19 +223,123 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     """
     to_encode = data.copy()
     
+    # NumericDate claims (RFC 7519) as plain ints, from a single clock read
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        lifetime = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
     
     to_encode.update({
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + lifetime,
+        "iat": now,
         "type": "refresh"
     })
     
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    return _encode_token(to_encode)
+
+
+# Recently verified tokens, keyed by SHA-256 of the token string. Entries are
+# reused for at most _TOKEN_CACHE_TTL seconds and never past the token's exp.
+_TOKEN_CACHE_MAX = 10_000
+_TOKEN_CACHE_TTL = 5.0
+_token_cache: "OrderedDict[bytes, tuple[dict, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _verify_hs256(token: str) -> Optional[dict]:
+    """Verify an HS256 JWT directly with hmac/hashlib
+    
+    Same checks as jwt.decode (header algorithm, signature, required
+    claims, exp/nbf), but reports failure as None instead of raising.
+    """
+    try:
+        header_b64, payload_b64, sig_b64 = token.rsplit(".", 2)
+        header = orjson.loads(_b64url_decode(header_b64))
+        signature = _b64url_decode(sig_b64)
+    except (ValueError, TypeError):
+        return None
+    
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        return None
+    
+    mac = _HMAC_SHA256.copy()
+    mac.update(f"{header_b64}.{payload_b64}".encode())
+    if not hmac.compare_digest(mac.digest(), signature):
+        return None
+    
+    try:
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or any(claim not in payload for claim in _REQUIRED_CLAIMS):
+        return None
+    
+    now = time.time()
+    exp = payload["exp"]
+    if not isinstance(exp, (int, float)) or now >= exp:
+        return None
+    nbf = payload.get("nbf")
+    if nbf is not None and (not isinstance(nbf, (int, float)) or now < nbf):
+        return None
+    
+    return payload
+
+
+def _verify_with_library(token: str) -> Optional[dict]:
+    """Verify a JWT with PyJWT (any configured algorithm); None if invalid"""
+    try:
+        return jwt.decode(
+            token,
+            _JWT_VERIFY_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"require": list(_REQUIRED_CLAIMS)},
+        )
+    except InvalidTokenError:
+        return None
+
+
+# A compact JWT is three dot-separated segments; anything outside these bounds
+# can't be one of ours
+_MIN_TOKEN_LEN = 20
+_MAX_TOKEN_LEN = 4096
+
+
+def _decode_token(token: str) -> Optional[dict]:
+    """Decode and verify a JWT, consulting the short-lived cache first
+    
+    Returns:
+        A copy of the payload, or None if the token is invalid or expired
+    """
+    # Cheap structural check first, so garbage never reaches hashing or HMAC
+    if not token or not _MIN_TOKEN_LEN <= len(token) <= _MAX_TOKEN_LEN or token.count(".") != 2:
+        return None
+    
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.monotonic()
+    
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            payload, cached_until = entry
+            if now < cached_until and time.time() < payload.get("exp", 0):
+                _token_cache.move_to_end(key)
+                return dict(payload)
+            del _token_cache[key]
+    
+    if settings.ALGORITHM == "HS256":
+        payload = _verify_hs256(token)
+    else:
+        payload = _verify_with_library(token)
+    if payload is None:
+        return None
+    
+    with _token_cache_lock:
+        _token_cache[key] = (payload, now + _TOKEN_CACHE_TTL)
+        if len(_token_cache) > _TOKEN_CACHE_MAX:
+            _token_cache.popitem(last=False)
+    
+    return dict(payload)
 
 
 def verify_token(token: str) -> dict:
@@ -110,15 +354,14 @@ def verify_token(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or expired
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError as e:
+    payload = _decode_token(token)
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
 
 
 def verify_token_silent(token: str) -> Optional[dict]:
@@ -132,11 +375,31 @@ def verify_token_silent(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload dictionary or None if invalid
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
-        return None
+    return _decode_token(token)
+
+
+# Below this many tokens, starting worker processes costs more than it saves
+_BATCH_VERIFY_MIN_PARALLEL = 1024
+
+
+def verify_tokens_batch(tokens: list[str]) -> list[Optional[dict]]:
+    """Verify many JWTs for offline/background jobs
+    
+    Args:
+        tokens: JWT strings to verify
+        
+    Returns:
+        Decoded payloads aligned with tokens; None for invalid ones
+    """
+    if len(tokens) < _BATCH_VERIFY_MIN_PARALLEL:
+        return [verify_token_silent(t) for t in tokens]
+    
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(verify_token_silent, tokens, chunksize=256))
+
+
+# 10**n for the OTP lengths we use, so generate_otp skips the power per call
+_POW10 = tuple(10 ** n for n in range(12))
 
 
 def generate_otp(length: int = 6) -> str:
@@ -148,11 +411,55 @@ def generate_otp(length: int = 6) -> str:
     Returns:
         Random numeric OTP string
     """
-    import secrets
-    # Generate a secure random number with the specified number of digits
-    max_val = 10 ** length
-    otp_num = secrets.randbelow(max_val)
-    return str(otp_num).zfill(length)
+    # Secure random number below 10^length, zero-padded to length digits
+    space = _POW10[length] if length < len(_POW10) else 10 ** length
+    return f"{secrets.randbelow(space):0{length}d}"
+
+
+# Character-class bits for validate_password_strength
+_HAS_UPPER = 1
+_HAS_LOWER = 2
+_HAS_DIGIT = 4
+_HAS_SPECIAL = 8
+_HAS_ALL = _HAS_UPPER | _HAS_LOWER | _HAS_DIGIT | _HAS_SPECIAL
+
+
+# Hashed membership instead of scanning a string for every character
+_SPECIAL_CHARS: frozenset[str] = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
+
+
+def _classify(char: str) -> int:
+    """Class bit for a single character (0 if it counts toward none)"""
+    if char.isupper():
+        return _HAS_UPPER
+    if char.islower():
+        return _HAS_LOWER
+    if char.isdigit():
+        return _HAS_DIGIT
+    if char in _SPECIAL_CHARS:
+        return _HAS_SPECIAL
+    return 0
+
+
+# byte -> class bit for ASCII; bytes.translate does the per-character lookup in C
+_CLASS_TABLE = bytes(_classify(chr(b)) if b < 128 else 0 for b in range(256))
+
+
+def _char_classes(password: str) -> int:
+    """Bitmask of the character classes present in password"""
+    if password.isascii():
+        seen = 0
+        for bit in set(password.encode("ascii").translate(_CLASS_TABLE)):
+            seen |= bit
+        return seen
+    
+    # Non-ASCII letters and digits (e.g. "É") still count, so classify per character
+    seen = 0
+    for c in password:
+        seen |= _classify(c)
+        if seen == _HAS_ALL:
+            break
+    return seen
 
 
 def validate_password_strength(password: str) -> tuple[bool, str]:
@@ -174,17 +481,18 @@ def validate_password_strength(password: str) -> tuple[bool, str]:
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
     
-    if not any(c.isupper() for c in password):
+    seen = _char_classes(password)
+    
+    if not seen & _HAS_UPPER:
         return False, "Password must contain at least one uppercase letter"
     
-    if not any(c.islower() for c in password):
+    if not seen & _HAS_LOWER:
         return False, "Password must contain at least one lowercase letter"
     
-    if not any(c.isdigit() for c in password):
+    if not seen & _HAS_DIGIT:
         return False, "Password must contain at least one digit"
     
-    special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-    if not any(c in special_chars for c in password):
+    if not seen & _HAS_SPECIAL:
         return False, "Password must contain at least one special character (!@#$%^&*()...)"
     
     return True, "Password is strong"
\ No newline at end of file